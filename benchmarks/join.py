@@ -0,0 +1,60 @@
+"""
+Compare `join.align` against the chained `reduce(pd.merge)` it replaced, for k inputs
+keyed on Date with staggered start and end dates.
+
+    python benchmarks/join.py [--rows 20000] [--inputs 9] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+from functools import reduce
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from join import align
+
+
+def sample_frames(rows: int, inputs: int) -> list[pd.DataFrame]:
+    """Monthly-style inputs, each covering a slightly different span of one date range."""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("1900-01-01", periods=rows, freq="D")
+    frames = []
+    for i in range(inputs):
+        span = dates[rng.integers(0, rows // 50):rows - rng.integers(0, rows // 50)]
+        frames.append(pd.DataFrame({"Date": span, f"Series {i}": rng.normal(100, 10, len(span))}))
+    return frames
+
+
+def baseline(frames: list[pd.DataFrame], how: str) -> pd.DataFrame:
+    return reduce(lambda left, right: pd.merge(left, right, on="Date", how=how), frames)
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--inputs", type=int, default=9)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    frames = sample_frames(args.rows, args.inputs)
+    print(f"{args.inputs} inputs of up to {args.rows} rows")
+    for how in ("inner", "outer"):
+        pd.testing.assert_frame_equal(baseline(frames, how).reset_index(drop=True), align(frames, how=how))
+        before = timed(lambda: baseline(frames, how), args.repeat)
+        after = timed(lambda: align(frames, how=how), args.repeat)
+        print(f"{how:5s} reduce(pd.merge): {before:8.2f} ms   align: {after:8.2f} ms   speedup: {before / after:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare the DataFrame -> JSON response path against the previous one
+(`df.replace({np.nan: None}).to_dict(orient="records")` encoded by JSONResponse), and
+time the Arrow IPC and Parquet bodies built from the same frame, and the first chunk versus
+the whole body of the streamed CSV and NDJSON formats.
+
+    python benchmarks/serialization.py [--rows 20000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serialization import arrow_ipc, csv_chunks, ndjson_chunks, parquet_bytes, records_json
+
+
+def sample_frame(rows: int) -> pd.DataFrame:
+    """A daily series shaped like a route response: Date, value and Year/Month/Day."""
+    dates = pd.date_range("1960-01-01", periods=rows, freq="D")
+    values = np.round(np.random.default_rng(0).normal(3.0, 1.0, rows), 3)
+    values[::97] = np.nan
+    return pd.DataFrame({"Date": dates, "SOFR": values, "Year": dates.year, "Month": dates.month, "Day": dates.day})
+
+
+def baseline(df: pd.DataFrame) -> bytes:
+    date_cols = [col for col, dtype in df.dtypes.items() if pd.api.types.is_datetime64_any_dtype(dtype)]
+    if date_cols:
+        df = df.assign(**{col: df[col].dt.strftime("%Y-%m-%d") for col in date_cols})
+    records = df.replace({np.nan: None}).to_dict(orient="records")
+    return JSONResponse(content=records).body
+
+
+def timed(fn, df: pd.DataFrame, repeat: int) -> float:
+    fn(df)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(df)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def first_chunk(chunks):
+    return lambda df: next(chunks(df))
+
+
+def whole(chunks):
+    return lambda df: b"".join(chunks(df))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    df = sample_frame(args.rows)
+    assert baseline(df) == records_json(df), "serializers disagree"
+
+    before = timed(baseline, df, args.repeat)
+    after = timed(records_json, df, args.repeat)
+    print(f"{args.rows} rows, {len(records_json(df)) / 1024:.0f} KiB")
+    print(f"sanitize_for_json + JSONResponse: {before:8.2f} ms")
+    print(f"records_json:                     {after:8.2f} ms")
+    print(f"speedup:                          {before / after:8.2f}x")
+    print(f"arrow_ipc:                        {timed(arrow_ipc, df, args.repeat):8.2f} ms, {len(arrow_ipc(df)) / 1024:.0f} KiB")
+    print(f"parquet_bytes:                    {timed(parquet_bytes, df, args.repeat):8.2f} ms, {len(parquet_bytes(df)) / 1024:.0f} KiB")
+    for name, chunks in (("csv_chunks", csv_chunks), ("ndjson_chunks", ndjson_chunks)):
+        print(f"{name + ' first chunk:':34s}{timed(first_chunk(chunks), df, args.repeat):8.2f} ms "
+              f"(whole body {timed(whole(chunks), df, args.repeat):.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,30 @@
 from http.client import HTTPException
 import pandas as pd
-from fredapi import Fred
-from dotenv import load_dotenv
-import os
+from pipeline import fetch, registered
 
-load_dotenv()
 
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-
-fred = Fred(api_key=FRED_API_KEY)
-
-
-def _fetch_us_households(start_date=None, end_date=None):
+@registered('TTLHH')
+def _fetch_us_households(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
-    Total Households (TTLHH) | path: /households | freq default:
+    Total Households (TTLHH) | path: /households | freq default: A
     """
-    series = fred.get_series('TTLHH')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'US Households']
+    return fetch('TTLHH', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
 
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-    
-    df['US Households'] = (df['US Households'] * 1000)
-    
-    return df
-
-
-def _fetch_us_population(start_date=None, end_date=None):
+@registered('POPTHM')
+def _fetch_us_population(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
-    Population (POPTHM) | path: /population | freq default:
+    Population (POPTHM) | path: /population | freq default: M
     """
-    series = fred.get_series('POPTHM')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'US Population']
-
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
+    return fetch('POPTHM', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    df['US Population']= df['US Population'] * 1000
 
-    return df
-
-
-def _fetch_us_birthrate(start_date:str=None, end_date:str=None, freq:str=None):
+@registered('SPDYNCBRTINUSA')
+def _fetch_us_birthrate(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
-    Crude Birth Rate for the United States (SPDYNCBRTINUSA). Births per 1000 people. | path: /us-birthrate | freq default: M
+    Crude Birth Rate for the United States (SPDYNCBRTINUSA). Births per 1000 people. | path: /us-birthrate | freq default: A
     """
-    series = fred.get_series('SPDYNCBRTINUSA')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'Births Per 1000']
-
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    if freq.upper() == 'M':
-        df = df.set_index("Date").resample('MS').ffill().reset_index()
-
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    return df
+    return fetch('SPDYNCBRTINUSA', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
 
 def _fetch_birth_death_data(start_year: int | None = None, end_year: int | None = None, race: str | None = None) -> pd.DataFrame:
@@ -1,167 +1,57 @@
-from fredapi import Fred
-from dotenv import load_dotenv
-import os
+from pipeline import fetch, registered
 
-load_dotenv()
 
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-
-fred = Fred(api_key=FRED_API_KEY)
-
-
-def _fetch_median_home_prices(start_date=None, end_date=None):
+@registered('MSPUS')
+def _fetch_median_home_prices(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
     Median Sales Price of Houses Sold for the United States (MSPUS) | path: /mspus | freq default: M
     """
-    series = fred.get_series('MSPUS')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'Median Home Sales Price']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df = df.set_index("Date").resample('MS').ffill().reset_index()
-
-    df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
-    df['Year'] = df['Date'].apply(lambda x: int(x[:4]))
-    df['Month'] = df['Date'].apply(lambda x: int(x[5:7]))
-    df['Day'] = df['Date'].apply(lambda x: int(x[8:]))
-
-    return df
+    return fetch('MSPUS', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
 
-def _fetch_median_home_price_new(start_date=None, end_date=None):
+@registered('MSPNHSUS')
+def _fetch_median_home_price_new(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
-    Median Sales Price for New Houses Sold in the United States (MSPNHSUS) | path: /mspnus | freq default:
+    Median Sales Price for New Houses Sold in the United States (MSPNHSUS) | path: /mspnus | freq default: M
     """
-    series = fred.get_series('MSPNHSUS')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'Median New Home Price']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
+    return fetch('MSPNHSUS', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
-    df['Year'] = df['Date'].apply(lambda x: int(x[:4]))
-    df['Month'] = df['Date'].apply(lambda x: int(x[5:7]))
-    df['Day'] = df['Date'].apply(lambda x: int(x[8:]))
 
-    return df
-
-
-def _fetch_caseshiller_home_price_index(start_date:str=None, end_date:str=None):
+@registered('CSUSHPINSA')
+def _fetch_caseshiller_home_price_index(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
-    S&P CoreLogic Case-Shiller U.S. National Home Price Index (CSUSHPINSA) | path: /cshi | freq default:
+    S&P CoreLogic Case-Shiller U.S. National Home Price Index (CSUSHPINSA) | path: /cshi | freq default: M
     """
-    series = fred.get_series('CSUSHPINSA')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'CSHI']
-    df['CSHI'] = round(df['CSHI'], 2)
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    return df
+    return fetch('CSUSHPINSA', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
 
-def _fetch_new_homes_ns(start_date:str=None, end_date:str=None, freq:str=None):
+@registered('NHFSEPNTS')
+def _fetch_new_homes_ns(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
-    New Houses for Sale by Stage of Construction, Not Started (NHFSEPNTS) | path: /new-homes-us | freq default:
+    New Houses for Sale by Stage of Construction, Not Started (NHFSEPNTS) | path: /new-homes-ns | freq default: M
     """
-    series = fred.get_series('NHFSEPNTS')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'New Homes NS']
-
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    df['New Homes NS'] = df['New Homes NS'] * 1000
+    return fetch('NHFSEPNTS', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    return df
 
-
-def _fetch_new_homes_uc(start_date:str=None, end_date:str=None, freq:str=None):
+@registered('NHFSEPUCS')
+def _fetch_new_homes_uc(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
-    New Houses for Sale by Stage of Construction, Under Construction (NHFSEPUCS) | path: /new-homes-uc | freq default: 
+    New Houses for Sale by Stage of Construction, Under Construction (NHFSEPUCS) | path: /new-homes-uc | freq default: M
     """
-    series = fred.get_series('NHFSEPUCS')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'New Homes UC']
-
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    df['New Homes UC'] = df['New Homes UC'] * 1000
+    return fetch('NHFSEPUCS', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    return df
 
-
-def _fetch_new_homes_comp(start_date:str=None, end_date:str=None, freq:str=None):
+@registered('NHFSEPCS')
+def _fetch_new_homes_comp(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
     New Houses for Sale by Stage of Construction, Completed (NHFSEPCS) | path: /new-homes-comp | freq default: M
     """
-    series = fred.get_series('NHFSEPCS')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'New Homes Comp']
-
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
+    return fetch('NHFSEPCS', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    df['New Homes Comp'] = df['New Homes Comp'] * 1000
 
-    return df
-
-
-def _fetch_new_sf_homes_for_sale(start_date:str=None, end_date:str=None, freq:str=None):
+@registered('HNFSUSNSA')
+def _fetch_new_sf_homes_for_sale(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
-    New One Family Houses for Sale in the United States (HNFSUSNSA) | path: /new-sf-homes-for-sale | freq defalt: M
+    New One Family Houses for Sale in the United States (HNFSUSNSA) | path: /new-sf-homes-for-sale | freq default: M
     """
-    series = fred.get_series('HNFSUSNSA')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'New SF Homes']
-
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    df['New SF Homes'] = df['New SF Homes'] * 1000
-
-    return df
+    return fetch('HNFSUSNSA', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
\ No newline at end of file
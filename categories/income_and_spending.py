@@ -1,137 +1,64 @@
 import pandas as pd
-from fredapi import Fred
-from dotenv import load_dotenv
-import os
-from utils import merge_on_year, scale_for_inflation, calc_mtg_pi_payment
+from pipeline import annual, fetch, registered
+from series_cache import get_stored, uses_series
+from deflator import cpi_deflator
+from join import align
+from utils import calc_mtg_pi_payment
 import numpy as np
 
-load_dotenv()
 
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-
-fred = Fred(api_key=FRED_API_KEY)
-
-
-def _fetch_real_disposable_personal_income(start_date=None, end_date=None):
+@registered('DSPI')
+def _fetch_real_disposable_personal_income(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
-    Real Disposable Personal Income (DSPI) | path: /rdpi | default freq:
+    Real Disposable Personal Income (DSPI) | path: /rdpi | default freq: M
     """
-    series = fred.get_series('DSPI')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'RDPI']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
-    df['Year'] = df['Date'].apply(lambda x: int(x[:4]))
-    df['Month'] = df['Date'].apply(lambda x: int(x[5:7]))
-    df['Day'] = df['Date'].apply(lambda x: int(x[8:]))
-
-    df['RDPI'] = df['RDPI'] * 1000000000
-
-
-def _fetch_vehicle_ins_premiums(start_date:str=None, end_date:str=None):
+    return fetch('DSPI', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
+
+
+@registered('CXU500110LB0101M')
+def _fetch_vehicle_ins_premiums(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
-    Expenditures: Vehicle Insurance: All Consumer Units (CXU500110LB0101M) | path: /vehicle-insurance | default freq: M 
+    Expenditures: Vehicle Insurance: All Consumer Units (CXU500110LB0101M) | path: /vehicle-insurance | default freq: M
     """
-    series = fred.get_series('CXU500110lB0101M')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'Vehicle Ins Annual']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df = df.set_index("Date").resample('MS').ffill().reset_index()
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    return df
-
-
-def _fetch_pce_healthcare(start_date:str=None, end_date:str=None):
+    return fetch('CXU500110LB0101M', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
+
+
+@registered('DHLCRC1Q027SBEA')
+def _fetch_pce_healthcare(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
     PCE Services: Healthcare (DHLCRC1Q027SBEA) | path: /pce-healthcare | default freq: M
     """
-    series = fred.get_series('DHLCRC1Q027SBEA')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'PCE Healthcare']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df = df.set_index("Date").resample('MS').ffill().reset_index()
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-    
-    df['PCE Healthcare'] = df['PCE Healthcare'] * 1000000000
-
-    return df
-
-
-def _fetch_houshold_ops_spend(start_date:str=None, end_date:str=None):
+    return fetch('DHLCRC1Q027SBEA', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
+
+
+@registered('CXUHHOPERLB0101M')
+def _fetch_houshold_ops_spend(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
     Expenditures: Household Operations: All Consumer Units (CXUHHOPERLB0101M) | path: /hh-ops | default freq: M
     """
-    series = fred.get_series('CXUHHOPERLB0101M')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'Household Ops Annual']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df = df.set_index("Date").resample('MS').ffill().reset_index()
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    return df
+    return fetch('CXUHHOPERLB0101M', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
 
-def _fetch_build_home_affordability(start_year:int=None, end_year:int=None):
+# Series the home affordability matrix is built from
+AFFORDABILITY_SERIES = ('CPIAUCSL', 'PCU9241269241262', 'MSPUS', 'MEFAINUSA646N', 'MORTGAGE30US')
+
+# Full matrix and the versions of the series it was built from
+_affordability: tuple | None = None
+
+
+def _build_home_affordability_matrix() -> pd.DataFrame:
     """
-    Home affordabiltiy matrix by year | path: /home-affordability | default freq: A
+    Home affordability matrix over every year, computed column-wise.
     """
     hoi_ref_premium = 3303
     hoi_ref_year = 2024
 
-    #CPI table - resampled to annual on mean
-    cpi = fred.get_series('CPIAUCSL')
-    cpi_df = cpi.to_frame().reset_index()
-    cpi_df.columns = ['Date', 'CPI']
-    cpi_df['Date'] = pd.to_datetime(cpi_df['Date'])
-    cpi_df.set_index('Date', inplace=True)
-    cpi_df = cpi_df.resample('YE').max()
-    cpi_df.index = cpi_df.index.year
-    cpi_df.reset_index(inplace=True)
-    cpi_df.columns = ['Year', 'CPI']
-
-    #HOI PPI table - resampled to annual on mean
-    hoi_series = fred.get_series('PCU9241269241262')
-    hoi_df = hoi_series.to_frame().reset_index()
-    hoi_df.columns = ['Date', 'HOI PPI']
-    hoi_df['Date'] = pd.to_datetime(hoi_df['Date'])
-    hoi_df.set_index('Date', inplace=True)
-    hoi_df = hoi_df.resample('YE').mean()
-    hoi_df.index = hoi_df.index.year
-    hoi_df.reset_index(inplace=True)
-    hoi_df.columns = ['Year', 'HOI PPI']
+    #CPI table - annual max, precomputed at ingest
+    cpi = cpi_deflator()
+    cpi_df = cpi.annual('max')
+
+    #HOI PPI table - annual mean, precomputed at ingest
+    hoi_df = annual('PCU9241269241262')
     hoi_df['HOI PPI'] = round(hoi_df['HOI PPI'], 3)
 
     #Estimate HOI premiums based on reference year adjusted by PPI
@@ -139,7 +66,7 @@ def _fetch_build_home_affordability(start_year:int=None, end_year:int=None):
     hoi_df['HOI Premium Real'] = round((hoi_df['HOI PPI'] * (hoi_ref_premium / hoi_ref_cpi)), 2)
 
     #Merge the datasets
-    merged_hoi_df = merge_on_year([hoi_df, cpi_df], how='outer')
+    merged_hoi_df = align([hoi_df, cpi_df], on='Year', how='outer')
 
     # anchor year where both PPI + Premium exist
     anchor_year = 1998
@@ -153,54 +80,54 @@ def _fetch_build_home_affordability(start_year:int=None, end_year:int=None):
     )
     merged_hoi_df.loc[mask, "HOI PPI"] = np.nan
     # Add scaled premiums using CPI
-    merged_hoi_df['HOI Premium Nominal'] = merged_hoi_df.apply(lambda row: scale_for_inflation(cpi_df, 2024, row['Year'], row['HOI Premium Real']), axis=1)
-
-    #Median Home Prices DF - resampled to annual as mean
-    median_home_prices = fred.get_series('MSPUS')
-    df_home_median_prices = median_home_prices.to_frame().reset_index()
-    df_home_median_prices.columns = ['Date', 'Median Sales Price']
-    df_home_median_prices['Date'] = pd.to_datetime(df_home_median_prices['Date'])
-    df_home_median_prices.set_index('Date', inplace=True)
-    df_home_median_prices_annual = df_home_median_prices.resample('YE').mean()
-    df_home_median_prices_annual.index = df_home_median_prices_annual.index.year
-    df_home_median_prices_annual.reset_index(inplace=True)
-    df_home_median_prices_annual.columns = ['Year', 'Median Sales Price']
+    merged_hoi_df['HOI Premium Nominal'] = cpi.scale(merged_hoi_df['HOI Premium Real'].to_numpy(), 2024, merged_hoi_df['Year'].to_numpy(), 'max')
+
+    #Median Home Prices DF - annual mean, precomputed at ingest
+    df_home_median_prices_annual = annual('MSPUS').rename(columns={'Median Home Sales Price': 'Median Sales Price'})
 
     #Median Family Income - annual series
-    median_family_income = fred.get_series('MEFAINUSA646N')
-    df_median_family_income =  median_family_income.to_frame().reset_index()
-    df_median_family_income.columns = ['Date', 'Median Family Income']
-    df_median_family_income['Date'] = pd.to_datetime(df_median_family_income['Date'])
-    df_median_family_income.set_index('Date', inplace=True)
-    df_median_family_income.index = df_median_family_income.index.year
-    df_median_family_income.reset_index(inplace=True)
-    df_median_family_income.columns = ['Year', 'Median Family Income']
-
-    #30Yr Mortgage Rates - resampled to annual as mean
-    mtg30 = fred.get_series('MORTGAGE30US')
-    df_mtg30 = mtg30.to_frame().reset_index()
-    df_mtg30.columns = ['Date', '30yr Mtg Rate']
-    df_mtg30['Date'] = pd.to_datetime(df_mtg30['Date'])
-    df_mtg30.set_index('Date', inplace=True)
-    df_mtg30 = df_mtg30.resample('YE').mean()
-    df_mtg30.index = df_mtg30.index.year
-    df_mtg30.reset_index(inplace=True)
-    df_mtg30.columns = ['Year', '30yr Mtg Rate']
+    df_median_family_income = annual('MEFAINUSA646N')
+
+    #30Yr Mortgage Rates - annual mean, precomputed at ingest
+    df_mtg30 = annual('MORTGAGE30US').rename(columns={'30yr Mortgage Rate': '30yr Mtg Rate'})
     df_mtg30['30yr Mtg Rate'] = round(df_mtg30['30yr Mtg Rate'], 3)
 
     #Merge datasets and add customer features
-    cdf = merge_on_year([merged_hoi_df, df_home_median_prices_annual, df_median_family_income, df_mtg30])
+    cdf = align([merged_hoi_df, df_home_median_prices_annual, df_median_family_income, df_mtg30], on='Year', how='inner')
     cdf['Avg Loan Amount'] = cdf['Median Sales Price'] * .8
-    cdf['Mtg PI Monthly'] = cdf.apply(lambda row: calc_mtg_pi_payment(row['Avg Loan Amount'], row['30yr Mtg Rate']), axis=1).round(2)
+    cdf['Mtg PI Monthly'] = pd.Series(calc_mtg_pi_payment(cdf['Avg Loan Amount'].to_numpy(), cdf['30yr Mtg Rate'].to_numpy()), index=cdf.index).round(2)
     cdf['Mtg PI Annual'] = round(cdf['Mtg PI Monthly'] * 12, 2)
     cdf['Mtg PII Annual'] = round(cdf['Mtg PI Annual'] + cdf['HOI Premium Nominal'], 2)
     cdf['Mtg PII Monthly'] = round((cdf['Mtg PI Annual'] / 12) + (cdf['HOI Premium Nominal'] / 12), 2)
     cdf['Mtg Ratio'] = round(cdf['Mtg PII Annual'] / cdf['Median Family Income'], 3)
 
-    #Filter by year(s)
-    if start_year is not None:
-        cdf = cdf[cdf['Year'] >= start_year]
-    if end_year is not None:
-        cdf = cdf[cdf['Year'] <= end_year]
+    return cdf
+
+
+def _home_affordability_matrix() -> pd.DataFrame:
+    """
+    The full matrix, rebuilt only once one of its input series has new data.
+    """
+    global _affordability
+    version = tuple((s.series_id, s.last_updated, len(s.series)) for s in map(get_stored, AFFORDABILITY_SERIES))
+    current = _affordability
+    if current is not None and current[0] == version:
+        return current[1]
+    cdf = _build_home_affordability_matrix()
+    _affordability = (version, cdf)
+    return cdf
+
+
+@uses_series(*AFFORDABILITY_SERIES, fan_out=True)
+def _fetch_build_home_affordability(start_year:int=None, end_year:int=None):
+    """
+    Home affordabiltiy matrix by year | path: /home-affordability | default freq: A
+    """
+    cdf = _home_affordability_matrix()
+
+    #Filter by year(s), by binary search on the sorted years
+    years = cdf['Year'].to_numpy()
+    lo = years.searchsorted(start_year, side='left') if start_year is not None else 0
+    hi = years.searchsorted(end_year, side='right') if end_year is not None else len(years)
 
-    return cdf
\ No newline at end of file
+    return cdf.iloc[lo:hi]
@@ -1,73 +1,51 @@
-from fredapi import Fred
-from dotenv import load_dotenv
-import os
-from utils import merge_on_date, scale_for_inflation
+from deflator import cpi_deflator
+from pipeline import fetch, frame, frame_slice, registered
+from series_cache import uses_series
+from join import align
+import numpy as np
 import pandas as pd
 
-load_dotenv()
 
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-
-fred = Fred(api_key=FRED_API_KEY)
-
-
-def _fetch_cpi(start_date:str=None, end_date:str=None):
+@registered('CPIAUCSL')
+def _fetch_cpi(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
     Consumer Price Index for All Urban Consumers: All Items in U.S. City Average (CPIAUCSL)
     """
-    series = fred.get_series('CPIAUCSL')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'CPI']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    # df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    # df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    # df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    return df
+    return fetch('CPIAUCSL', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
 
+@uses_series('CPIAUCSL')
 def _fetch_scaled_with_cpi(from_year:int=1980, to_year:int=2025, amount:float=100.0):
-    cpi_df = _fetch_cpi()
-    cpi_df['Date'] = pd.to_datetime(cpi_df['Date'])
-    cpi_df.set_index('Date', inplace=True)
-    # Resample annually (year-end) and take the mean
-    cpi_df = cpi_df.resample('YE').mean()
-    cpi_df['Year'] = cpi_df.index.year
-    
-    val = scale_for_inflation(cpi_df=cpi_df, from_year=from_year, to_year=to_year, amount=amount)
-
-    return val
+    # Annual mean CPI, precomputed at ingest
+    return cpi_deflator().scale(amount, from_year, to_year)
 
 
-def _fetch_pce(start_date=None, end_date=None):
+@uses_series('CPIAUCSL')
+def _fetch_scaled_batch_with_cpi(amounts:list, from_periods, to_periods):
+    """
+    Scale many amounts between years (annual mean CPI) or months (monthly CPI) in one vectorized pass | path: /scale-for-inflation/batch
+    """
+    cpi = cpi_deflator()
+    checked = {}
+    for name, periods in (('from_periods', from_periods), ('to_periods', to_periods)):
+        try:
+            checked[name] = cpi.check(periods)
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from None
+    amounts = np.asarray(amounts, dtype='float64')
+    scaled = cpi.convert(amounts, checked['from_periods'], checked['to_periods'])
+    return pd.DataFrame({'Amount': amounts, 'Scaled Amount': scaled})
+
+
+@registered('PCE')
+def _fetch_pce(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
     Personal Consumption Expenditures (PCE)
     """
-    series = fred.get_series('PCE')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'PCE']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    # df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    # df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    # df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    df['PCE'] = df['PCE'] * 1000000000
-
-    return df
+    return fetch('PCE', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
 
+@uses_series('CUSR0000SETA02', 'CPIAUCSL', fan_out=True)
 def _fetch_used_car_prices(start_date:str=None, end_date:str=None):
     """
     CPI Used Cars and Trucks (CUSR0000SETA02). Prices calculated based on CPI index applied to reference year and price
@@ -76,33 +54,19 @@ def _fetch_used_car_prices(start_date:str=None, end_date:str=None):
     ref_price = 28472
 
     # Used Auto CPI
-    used_auto_series = fred.get_series('CUSR0000SETA02')
-    used_auto_df = used_auto_series.to_frame().reset_index()
-    used_auto_df.columns = ['Date', 'Used Auto CPI']
+    used_auto_df = frame('CUSR0000SETA02')
 
-    # CPI
-    _cpi_series = fred.get_series('CPIAUCSL')
-    _cpi_df = _cpi_series.to_frame().reset_index()
-    _cpi_df.columns = ['Date', 'CPI']
-
-    used_merged = used_auto_df.merge(_cpi_df, 'inner', 'Date')
+    # CPI for each month
+    used_merged, cpi = cpi_deflator().matched(used_auto_df)
 
     used_merged['Used Auto Price Real'] = round(used_merged['Used Auto CPI'] * (ref_price / ref_auto_cpi),2)
-    ref_cpi = used_merged['CPI'].iloc[-1]
-    used_merged['Used Auto Price Nominal'] = round(used_merged['Used Auto Price Real'] * (used_merged['CPI'] / ref_cpi), 2)
+    ref_cpi = cpi[-1]
+    used_merged['Used Auto Price Nominal'] = round(used_merged['Used Auto Price Real'] * (cpi / ref_cpi), 2)
 
-    if start_date is not None:
-        used_merged = used_merged[used_merged['Date'] >= start_date]
-    if end_date is not None:
-        used_merged = used_merged[used_merged['Date'] <= end_date]
-    
-    used_merged['Date'] = used_merged['Date'].dt.strftime('%Y-%m-%d')
-
-    drop_cols = ['CPI']
-    
-    return used_merged.drop(columns=drop_cols)
+    return frame_slice(used_merged, start_date, end_date)
 
 
+@uses_series('CUUR0000SETA01', 'CPIAUCSL', fan_out=True)
 def _fetch_new_car_prices(start_date:str=None, end_date:str=None):
     """
     CPI New Cars and Trucks (CUUR0000SETA01). Prices calculated based on CPI index applied to reference year and price
@@ -111,32 +75,18 @@ def _fetch_new_car_prices(start_date:str=None, end_date:str=None):
     ref_price = 48397
 
     # New Auto CPI
-    new_auto_series = fred.get_series('CUUR0000SETA01')
-    new_auto_df = new_auto_series.to_frame().reset_index()
-    new_auto_df.columns = ['Date', 'New Auto CPI']
-
-    # CPI
-    _cpi_series = fred.get_series('CPIAUCSL')
-    _cpi_df = _cpi_series.to_frame().reset_index()
-    _cpi_df.columns = ['Date', 'CPI']
+    new_auto_df = frame('CUUR0000SETA01')
 
-    new_merged = new_auto_df.merge(_cpi_df, 'inner', 'Date')
+    # CPI for each month
+    new_merged, cpi = cpi_deflator().matched(new_auto_df)
     new_merged['New Auto Price Real'] = round(new_merged['New Auto CPI'] * (ref_price / ref_auto_cpi),2)
-    ref_cpi = new_merged['CPI'].iloc[-1]
-    new_merged['New Auto Price Nominal'] = round(new_merged['New Auto Price Real'] * (new_merged['CPI'] / ref_cpi), 2)
+    ref_cpi = cpi[-1]
+    new_merged['New Auto Price Nominal'] = round(new_merged['New Auto Price Real'] * (cpi / ref_cpi), 2)
 
-    if start_date is not None:
-        new_merged = new_merged[new_merged['Date'] >= start_date]
-    if end_date is not None:
-        new_merged = new_merged[new_merged['Date'] <= end_date]
-    
-    new_merged['Date'] = new_merged['Date'].dt.strftime('%Y-%m-%d')
-
-    drop_cols = ['CPI']
-    
-    return new_merged.drop(columns=drop_cols)
+    return frame_slice(new_merged, start_date, end_date)
 
 
+@uses_series('CUSR0000SETA02', 'CPIAUCSL', 'CUUR0000SETA01', fan_out=True)
 def _fetch_all_car_prices(start_date:str=None, end_date:str=None):
     """
     Merged dataset with New Car CPI (CUUR0000SETA01) and Used Car CPI (CUSR0000SETA02). Prices calculated based on CPI indices for New and Used autos applied to reference years and prices
@@ -144,6 +94,6 @@ def _fetch_all_car_prices(start_date:str=None, end_date:str=None):
     used_df = _fetch_used_car_prices(start_date=start_date, end_date=end_date)
     new_df = _fetch_new_car_prices(start_date=start_date, end_date=end_date)
 
-    df = merge_on_date([new_df, used_df])
+    df = align([new_df, used_df], on='Date', how='inner')
     
     return df
\ No newline at end of file
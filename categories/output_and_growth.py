@@ -1,40 +1,11 @@
-import pandas as pd
-from fredapi import Fred
-from dotenv import load_dotenv
-import os
+from pipeline import fetch, registered
 
-load_dotenv()
 
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-
-fred = Fred(api_key=FRED_API_KEY)
-
-
-def _fetch_gdp(start_date:str=None, end_date:str=None, freq:str=None):
+@registered('GDP')
+def _fetch_gdp(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
     Gross Domestic Product (GDP)
 
-    Frequencies: Quarterly - Q (default), Monthly - M
+    Frequencies: Quarterly - Q (default), Monthly - M, Annual - A
     """
-    series = fred.get_series('GDP')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'GDP']
-    df['Date'] = pd.to_datetime(df['Date'])
-    df['Date'] = df['Date'] - pd.Timedelta(days=1)
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    if freq == 'M':
-        df = df.set_index("Date").resample('MS').ffill().reset_index()
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    df['GDP'] = df['GDP'] * 1000000000
-
-    return df
\ No newline at end of file
+    return fetch('GDP', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
\ No newline at end of file
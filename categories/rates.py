@@ -1,133 +1,53 @@
-from fredapi import Fred
-from dotenv import load_dotenv
-import os
+from join import align
+from pipeline import fetch, registered
+from series_cache import uses_series
 
-load_dotenv()
 
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-
-fred = Fred(api_key=FRED_API_KEY)
-
-
-def _fetch_30yr_mortgage_rates(start_date=None, end_date=None, freq:str=None):
+@registered('MORTGAGE30US')
+def _fetch_30yr_mortgage_rates(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
     30-Year Fixed Rate Mortgage Average in the United States (MORTGAGE30US)
     
-    Frequencies: Weekly - W (default), Monthly - M
+    Frequencies: Weekly - W (default), Monthly - M, Quarterly - Q, Annual - A
     """
-    series = fred.get_series('MORTGAGE30US')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', '30yr Mortgage Rate']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    if freq == 'M':
-        df = df.set_index("Date").resample('MS').mean().reset_index()
-    
-    df['30yr Mortgage Rate'] = round(df['30yr Mortgage Rate'], 3)
+    return fetch('MORTGAGE30US', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
-    # df['Year'] = df['Date'].apply(lambda x: int(x[:4]))
-    # df['Month'] = df['Date'].apply(lambda x: int(x[5:7]))
-    # df['Day'] = df['Date'].apply(lambda x: int(x[8:]))
 
-    return df
-
-
-def _fetch_15yr_mortgage_rates(start_date=None, end_date=None, freq:str=None):
+@registered('MORTGAGE15US')
+def _fetch_15yr_mortgage_rates(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
     15-Year Fixed Rate Mortgage Average in the United States (MORTGAGE15US)
     
-    Frequencies: Weekly - W (default), Monthly - M
+    Frequencies: Weekly - W (default), Monthly - M, Quarterly - Q, Annual - A
     """
-    series = fred.get_series('MORTGAGE15US')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', '15yr Mortgage Rate']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    if freq == 'M':
-        df = df.set_index("Date").resample('MS').mean().reset_index()
-    
-    df['15yr Mortgage Rate'] = round(df['15yr Mortgage Rate'], 3)
-
-    df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
-    # df['Year'] = df['Date'].apply(lambda x: int(x[:4]))
-    # df['Month'] = df['Date'].apply(lambda x: int(x[5:7]))
-    # df['Day'] = df['Date'].apply(lambda x: int(x[8:]))
+    return fetch('MORTGAGE15US', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    return df
 
-
-def _fetch_all_mortgage_rates(start_date=None, end_date=None, freq:str=None):
+@uses_series('MORTGAGE30US', 'MORTGAGE15US', fan_out=True)
+def _fetch_all_mortgage_rates(start_date=None, end_date=None, freq:str=None, agg:str=None):
     """
     Fetch both 30-year and 15-year mortgage rates and merge them into a single DataFrame.
     """
-    df_30yr = _fetch_30yr_mortgage_rates(start_date, end_date, freq)
-    df_15yr = _fetch_15yr_mortgage_rates(start_date, end_date, freq)
-    
-    df_merged = df_30yr.merge(df_15yr, on='Date', how='outer')
-    
-    df_merged = df_merged.sort_values(by='Date').reset_index(drop=True)
+    df_30yr = _fetch_30yr_mortgage_rates(start_date, end_date, freq, agg)
+    df_15yr = _fetch_15yr_mortgage_rates(start_date, end_date, freq, agg)
     
-    return df_merged
+    return align([df_30yr, df_15yr], on='Date', how='outer')
 
 
-def _fetch_sofr(start_date:str=None, end_date:str=None, freq:str=None):
+@registered('SOFR')
+def _fetch_sofr(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
     Secured Overnight Financing Rate (SOFR)
 
-    Frequencies: Daily - D (default), Weekly - W, Monthly - W, Quarterly - M
+    Frequencies: Daily - D (default), Weekly - W, Monthly - M, Quarterly - Q, Annual - A
     Default period aggregation is mean.
     """
-    series = fred.get_series('SOFR')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'SOFR']
-    
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    if freq == 'W':
-        df = df.set_index("Date").resample('W').mean().reset_index()
-    if freq == 'M':
-        df = df.set_index("Date").resample('MS').mean().reset_index()
-    if freq == 'Q':
-        df = df.set_index("Date").resample('QS').mean().reset_index()
+    return fetch('SOFR', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-    df['SOFR'] = round(df['SOFR'], 3)
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
 
-    return df
-
-
-def _fetch_fed_funds_rate(start_date:str=None, end_date:str=None, freq:str=None):
+@registered('FEDFUNDS')
+def _fetch_fed_funds_rate(start_date:str=None, end_date:str=None, freq:str=None, agg:str=None):
     """
     Federal Funds Effective Rate (FEDFUNDS)
     """
-    series = fred.get_series('FEDFUNDS')
-    df = series.to_frame().reset_index()
-    df.columns = ['Date', 'Fed Funds Rate']
-
-    if start_date is not None:
-        df = df[df['Date'] >= start_date]
-    if end_date is not None:
-        df = df[df['Date'] <= end_date]
-    
-    df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    df["Year"] = df["Date"].apply(lambda x: int(x[:4]))
-    df["Month"] = df["Date"].apply(lambda x: int(x[5:7]))
-    df["Day"] = df["Date"].apply(lambda x: int(x[8:]))
-
-    return df
\ No newline at end of file
+    return fetch('FEDFUNDS', start_date=start_date, end_date=end_date, freq=freq, agg=agg)
\ No newline at end of file
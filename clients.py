@@ -1,8 +1,18 @@
+import asyncio
 from dataclasses import dataclass
+import threading
+import weakref
+import xml.etree.ElementTree as ET
+import httpx
+import pandas as pd
+from fredapi import Fred
 from openai import OpenAI
 from pydantic import BaseModel
+from dotenv import load_dotenv
 import os
 
+load_dotenv()
+
 
 @dataclass
 class XAIClient:
@@ -63,4 +73,155 @@ class XAIClient:
             return completion.choices[0].message.parsed
         
         except Exception as e:
-            print(f"Error: {e}")
\ No newline at end of file
+            print(f"Error: {e}")
+
+
+class PooledFred(Fred):
+    """
+    fredapi.Fred that sends its requests over a shared keep-alive httpx session instead of
+    opening a new urllib connection (and TLS handshake) per call.
+    """
+
+    def __init__(self, api_key: str, session: httpx.Client):
+        super().__init__(api_key=api_key)
+        self.session = session
+
+    # Overrides Fred's private (name-mangled) fetch helper, which every public method goes through
+    def _Fred__fetch_data(self, url):
+        url += '&api_key=' + self.api_key
+        response = self.session.get(url)
+        if response.is_error:
+            try:
+                root = ET.fromstring(response.content)
+            except ET.ParseError:
+                response.raise_for_status()
+            raise ValueError(root.get('message'))
+        return ET.fromstring(response.content)
+
+
+@dataclass
+class FredClient:
+    api_key: str = os.getenv("FRED_API_KEY")
+    pool_size: int = int(os.getenv("FRED_POOL_SIZE", "10"))
+    timeout: float = float(os.getenv("FRED_TIMEOUT", "30"))
+
+    def __post_init__(self):
+        self.session = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            ),
+            timeout=self.timeout,
+        )
+        self.client = PooledFred(api_key=self.api_key, session=self.session)
+
+    def get_series(self, series_id: str, observation_start=None, observation_end=None, **kwargs):
+        """
+        Get observations for a FRED series as a pandas Series indexed by date.
+
+        :param series_id: The FRED series ID (e.g., 'CPIAUCSL').
+        :param observation_start: Earliest observation date to return.
+        :param observation_end: Latest observation date to return.
+        """
+        return self.client.get_series(series_id, observation_start=observation_start, observation_end=observation_end, **kwargs)
+
+    def get_series_info(self, series_id: str):
+        """
+        Get metadata for a FRED series (title, frequency, units, last_updated, ...).
+
+        :param series_id: The FRED series ID (e.g., 'CPIAUCSL').
+        """
+        return self.client.get_series_info(series_id)
+
+    def close(self):
+        self.session.close()
+
+
+@dataclass
+class AsyncFredClient:
+    api_key: str = os.getenv("FRED_API_KEY")
+    pool_size: int = int(os.getenv("FRED_POOL_SIZE", "10"))
+    timeout: float = float(os.getenv("FRED_TIMEOUT", "30"))
+    root_url: str = "https://api.stlouisfed.org/fred"
+
+    def __post_init__(self):
+        # httpx async connections are bound to the event loop that opened them, so each loop
+        # gets its own client; entries go away with their loop
+        self._sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None:
+                # Clients of loops that have since closed can't be used or awaited again
+                for stale in [other for other in self._sessions if other.is_closed()]:
+                    del self._sessions[stale]
+                session = self._sessions[loop] = httpx.AsyncClient(
+                    base_url=self.root_url,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                    ),
+                    timeout=self.timeout,
+                )
+        return session
+
+    async def _fetch_json(self, path: str, params: dict) -> dict:
+        params = {**params, "api_key": self.api_key, "file_type": "json"}
+        response = await self._client().get(path, params=params)
+        if response.is_error:
+            try:
+                message = response.json().get("error_message")
+            except ValueError:
+                response.raise_for_status()
+            raise ValueError(message)
+        return response.json()
+
+    async def get_series(self, series_id: str, observation_start=None, observation_end=None, **kwargs) -> pd.Series:
+        """
+        Get observations for a FRED series as a pandas Series indexed by date, matching fredapi's output.
+
+        :param series_id: The FRED series ID (e.g., 'CPIAUCSL').
+        :param observation_start: Earliest observation date to return.
+        :param observation_end: Latest observation date to return.
+        """
+        params = {"series_id": series_id, **kwargs}
+        if observation_start is not None:
+            params["observation_start"] = pd.to_datetime(observation_start).strftime("%Y-%m-%d")
+        if observation_end is not None:
+            params["observation_end"] = pd.to_datetime(observation_end).strftime("%Y-%m-%d")
+
+        data = await self._fetch_json("/series/observations", params)
+        observations = data.get("observations", [])
+        # FRED marks missing values with '.', which to_numeric turns into NaN
+        index = pd.to_datetime([obs["date"] for obs in observations], format="%Y-%m-%d")
+        values = pd.to_numeric([obs["value"] for obs in observations], errors="coerce")
+        return pd.Series(values, index=index, dtype="float64")
+
+    async def get_series_info(self, series_id: str) -> pd.Series:
+        """
+        Get metadata for a FRED series (title, frequency, units, last_updated, ...).
+
+        :param series_id: The FRED series ID (e.g., 'CPIAUCSL').
+        """
+        data = await self._fetch_json("/series", {"series_id": series_id})
+        seriess = data.get("seriess") or []
+        if not seriess:
+            raise ValueError('No info exists for series id: ' + series_id)
+        return pd.Series(seriess[0])
+
+    async def aclose(self):
+        """
+        Close the client of every event loop, each on its own loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions = list(self._sessions.items())
+            self._sessions.clear()
+        for owner, session in sessions:
+            if owner is loop:
+                await session.aclose()
+            elif owner.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.aclose(), owner))
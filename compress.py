@@ -0,0 +1,283 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from dotenv import load_dotenv
+import os
+from starlette.datastructures import Headers, MutableHeaders
+import conditional
+from formats import MEDIA_TYPES, STREAMED, quality_values
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+load_dotenv()
+
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Total size of the raw and compressed response bodies kept by `bodies`
+BODY_CACHE_BYTES = int(os.getenv("BODY_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# Media types worth compressing; Parquet bodies are compressed already
+COMPRESSIBLE = ("application/json", "application/x-ndjson", "application/vnd.apache.arrow.stream", "text/")
+
+
+class _GzipStream:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Content codings by preference when the client rates several equally: (whole body, stream).
+# brotli and zstd are only offered when their packages are installed.
+CODECS = {}
+if zstandard is not None:
+    CODECS["zstd"] = (lambda body: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body), _ZstdStream)
+if brotli is not None:
+    CODECS["br"] = (lambda body: brotli.compress(body, quality=BROTLI_QUALITY), _BrotliStream)
+CODECS["gzip"] = (lambda body: gzip.compress(body, GZIP_LEVEL, mtime=0), _GzipStream)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    The content coding to use for an Accept-Encoding header, or None to send the body as is.
+    """
+    if not accept_encoding:
+        return None
+    # "*" stands for every coding the header doesn't name, including ones refused with q=0
+    named = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    best = None
+    for coding, q in quality_values(accept_encoding):
+        if coding == "*":
+            candidates = [candidate for candidate in CODECS if candidate not in named]
+        else:
+            candidates = [coding] if coding in CODECS else []
+        for candidate in candidates:
+            rank = (q, -list(CODECS).index(candidate))
+            if best is None or rank > best[0]:
+                best = (rank, candidate)
+    return best[1] if best is not None else None
+
+
+class BodyCache:
+    """
+    LRU of response bodies keyed by ETag, each holding the raw body plus any compressed
+    versions built from it, bounded by their total size. An ETag pins the function,
+    arguments, series versions and format a body was built from, so an entry never goes
+    stale; it is only evicted.
+    """
+
+    def __init__(self, maxbytes: int = BODY_CACHE_BYTES):
+        self.maxbytes = maxbytes
+        self._entries: OrderedDict[str, dict[str, bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, etag: str, coding: str = "identity") -> bytes | None:
+        with self._lock:
+            body = self._entries.get(etag, {}).get(coding)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+            return body
+
+    def put(self, etag: str, coding: str, body: bytes) -> None:
+        if len(body) > self.maxbytes:
+            return
+        with self._lock:
+            entry = self._entries.setdefault(etag, {})
+            self._size += len(body) - len(entry.get(coding, b""))
+            entry[coding] = body
+            self._entries.move_to_end(etag)
+            while self._size > self.maxbytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= sum(len(b) for b in evicted.values())
+
+    def size(self, etag: str, coding: str = "identity") -> int | None:
+        """
+        Length of a cached body, or None if it isn't cached; doesn't count as a hit or miss.
+        """
+        with self._lock:
+            body = self._entries.get(etag, {}).get(coding)
+            return len(body) if body is not None else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._size}
+
+
+bodies = BodyCache()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with the best coding the client accepts (zstd, br
+    or gzip) once they reach COMPRESSION_MIN_BYTES. A body sent in one piece with an ETag is
+    compressed once and then served from `bodies`; streamed bodies are compressed chunk by
+    chunk. Compressed responses get a weak ETag, since their bytes differ from the raw body's.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    def compresses(self, media_type: str, size: int | None) -> bool:
+        """
+        Whether a body of `media_type` is sent compressed to a client accepting a coding;
+        `size` is None for a streamed body, which is always compressed.
+        """
+        return media_type.startswith(COMPRESSIBLE) and (size is None or size >= self.minimum_size)
+
+    def not_modified(self, headers: MutableHeaders, coding: str | None) -> None:
+        """
+        Give a 304 the Vary and ETag of the 200 it stands in for, deciding whether that 200
+        was compressed as `compresses` does: from its representation and cached body size.
+        """
+        request = conditional.current()
+        etag = headers.get("etag")
+        media_type = MEDIA_TYPES.get(request.representation, "application/json") if request is not None else ""
+        if etag is None or not media_type.startswith(COMPRESSIBLE):
+            return
+        compressed = False
+        if coding is not None:
+            size = None if request.representation in STREAMED else bodies.size(etag)
+            if size is not None or request.representation in STREAMED:
+                compressed = self.compresses(media_type, size)
+            elif request.if_none_match is not None:
+                # Body evicted or built by another worker: the client's validator shows which it holds
+                compressed = "W/" + etag in [tag.strip() for tag in request.if_none_match.split(",")]
+        if compressed:
+            self._encoded(headers, None)
+        else:
+            headers.add_vary_header("Accept-Encoding")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+
+        start = None
+        stream = None
+
+        async def send_compressed(message):
+            nonlocal start, stream
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if message["status"] == 304:
+                    # Validators must match the 200 the client holds, compressed or not
+                    self.not_modified(headers, coding)
+                    start = False
+                    await send(message)
+                    return
+                media_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not media_type.startswith(COMPRESSIBLE):
+                    start = False
+                    await send(message)
+                elif coding is None:
+                    # The same URL may come back encoded for a client that accepts it
+                    headers.add_vary_header("Accept-Encoding")
+                    start = False
+                    await send(message)
+                else:
+                    # Held back until the first body message shows whether the body is streamed
+                    start = message
+                return
+
+            if message["type"] != "http.response.body" or not start:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(scope=start)
+
+            if stream is None and not more_body:
+                # Whole body in one message
+                if not self.compresses(headers.get("content-type", ""), len(body)):
+                    headers.add_vary_header("Accept-Encoding")
+                    await send(start)
+                    await send(message)
+                    start = False
+                    return
+                etag = headers.get("etag")
+                compressed = bodies.get(etag, coding) if etag else None
+                if compressed is None:
+                    compressed = CODECS[coding][0](body)
+                    if etag:
+                        bodies.put(etag, coding, compressed)
+                self._encoded(headers, coding)
+                headers["content-length"] = str(len(compressed))
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if stream is None:
+                stream = CODECS[coding][1]()
+                self._encoded(headers, coding)
+                if "content-length" in headers:
+                    del headers["content-length"]
+                await send(start)
+            data = stream.chunk(body) if body else b""
+            if not more_body:
+                data += stream.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _encoded(headers: MutableHeaders, coding: str | None) -> None:
+        if coding is not None:
+            headers["content-encoding"] = coding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = "W/" + etag
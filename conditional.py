@@ -0,0 +1,130 @@
+import hashlib
+from contextvars import ContextVar
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import parse_qs
+import pandas as pd
+from starlette.datastructures import Headers, MutableHeaders
+from formats import negotiate
+
+# Conditional-GET state of the request being handled, if any
+_current: ContextVar["Conditional | None"] = ContextVar("conditional", default=None)
+
+
+def current() -> "Conditional | None":
+    return _current.get()
+
+
+def http_date(last_updated: str) -> str | None:
+    """
+    FRED's last_updated (e.g. "2025-08-05 07:44:02-05") as an HTTP date, or None if it can't be parsed.
+    """
+    try:
+        stamp = pd.Timestamp(last_updated)
+    except (TypeError, ValueError):
+        return None
+    if stamp is pd.NaT:
+        return None
+    stamp = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+    return format_datetime(stamp.to_pydatetime(), usegmt=True)
+
+
+class Conditional:
+    """
+    Conditional-GET state of one request: the validators the client sent, and the ETag and
+    Last-Modified of the response once `afetch` knows which series versions it's built from.
+
+    The ETag covers the fetch function, its arguments, the version of every input series and
+    the response format, so it is known before anything is computed or serialized.
+    """
+
+    def __init__(self, if_none_match: str | None = None, if_modified_since: str | None = None,
+                 representation: str = "records"):
+        self.if_none_match = if_none_match
+        self.if_modified_since = if_modified_since
+        self.representation = representation
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+
+    @classmethod
+    def from_scope(cls, scope) -> "Conditional":
+        headers = Headers(scope=scope)
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        format = (query.get("format") or [None])[-1]
+        representation = format.strip().lower() if format else negotiate(headers.get("accept")) or "records"
+        return cls(headers.get("if-none-match"), headers.get("if-modified-since"), representation)
+
+    def validate(self, fn, kwargs: dict, version: tuple, last_updated: list) -> bool:
+        """
+        Set the response validators and report whether the client's copy is still current.
+        """
+        key = repr((fn.__module__, fn.__qualname__, sorted(kwargs.items(), key=lambda item: item[0]), version))
+        self.etag = f'"{hashlib.sha1(key.encode()).hexdigest()}-{self.representation}"'
+
+        dates = [date for date in map(http_date, filter(None, last_updated)) if date is not None]
+        self.last_modified = max(dates, key=parsedate_to_datetime) if dates else None
+        return self.not_modified
+
+    @property
+    def not_modified(self) -> bool:
+        if self.etag is None:
+            return False
+        # If-None-Match takes precedence; If-Modified-Since is only consulted without it
+        if self.if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in self.if_none_match.split(",")]
+            return "*" in tags or self.etag in tags
+        if self.if_modified_since is not None and self.last_modified is not None:
+            try:
+                return parsedate_to_datetime(self.last_modified) <= parsedate_to_datetime(self.if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def headers(self) -> dict:
+        headers = {"etag": self.etag}
+        if self.last_modified is not None:
+            headers["last-modified"] = self.last_modified
+        return headers
+
+
+class ConditionalGetMiddleware:
+    """
+    ASGI middleware that tracks conditional-GET state for each GET request. Successful
+    responses get the ETag/Last-Modified set during the request, and a response whose
+    validators match the client's is sent as a bodiless 304.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        conditional = Conditional.from_scope(scope)
+        token = _current.set(conditional)
+        not_modified = False
+
+        async def send_with_validators(message):
+            nonlocal not_modified
+            if message["type"] == "http.response.start":
+                if conditional.etag is not None and 200 <= message["status"] < 300:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in conditional.headers().items():
+                        headers[name] = value
+                    if conditional.not_modified:
+                        not_modified = True
+                        message["status"] = 304
+                        for name in ("content-length", "content-type"):
+                            if name in headers:
+                                del headers[name]
+            elif message["type"] == "http.response.body" and not_modified:
+                if message.get("more_body", False):
+                    return
+                message = {"type": "http.response.body", "body": b""}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_validators)
+        finally:
+            _current.reset(token)
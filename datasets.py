@@ -1,24 +1,16 @@
 from http.client import HTTPException
 import pandas as pd
-from fredapi import Fred
-from dotenv import load_dotenv
-import os
 import json
-from utils import merge_on_year, scale_for_inflation, calc_mtg_pi_payment
+from series_cache import get_series
+from utils import merge_on_year, calc_mtg_pi_payment
 import numpy as np
 
-load_dotenv()
-
-FRED_API_KEY = os.getenv("FRED_API_KEY")
-
-fred = Fred(api_key=FRED_API_KEY)
-
 
 # def _fetch_cpi(start_date:str=None, end_date:str=None):
 #     """
 #     Consumer Price Index for All Urban Consumers: All Items in U.S. City Average (CPIAUCSL)
 #     """
-#     series = fred.get_series('CPIAUCSL')
+#     series = get_series('CPIAUCSL')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'CPI']
     
@@ -39,7 +31,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Personal Consumption Expenditures (PCE)
 #     """
-#     series = fred.get_series('PCE')
+#     series = get_series('PCE')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'PCE']
     
@@ -62,7 +54,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Total Households (TTLHH)
 #     """
-#     series = fred.get_series('TTLHH')
+#     series = get_series('TTLHH')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'US Households']
 
@@ -85,7 +77,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Population (POPTHM)
 #     """
-#     series = fred.get_series('POPTHM')
+#     series = get_series('POPTHM')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'US Population']
 
@@ -108,7 +100,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Median Annual Family Income in the United States (MEFAINUSA646N)
 #     """
-#     series = fred.get_series('MEFAINUSA646N')
+#     series = get_series('MEFAINUSA646N')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Median Family Income']
     
@@ -133,7 +125,7 @@ fred = Fred(api_key=FRED_API_KEY)
     
 #     Frequencies: Weekly - W (default), Monthly - M
 #     """
-#     series = fred.get_series('MORTGAGE30US')
+#     series = get_series('MORTGAGE30US')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', '30yr Mortgage Rate']
     
@@ -161,7 +153,7 @@ fred = Fred(api_key=FRED_API_KEY)
     
 #     Frequencies: Weekly - W (default), Monthly - M
 #     """
-#     series = fred.get_series('MORTGAGE15US')
+#     series = get_series('MORTGAGE15US')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', '15yr Mortgage Rate']
     
@@ -187,7 +179,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Real Disposable Personal Income (DSPI)
 #     """
-#     series = fred.get_series('DSPI')
+#     series = get_series('DSPI')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'RDPI']
     
@@ -210,7 +202,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Median Sales Price of Houses Sold for the United States (MSPUS)
 #     """
-#     series = fred.get_series('MSPUS')
+#     series = get_series('MSPUS')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Median Home Sales Price']
     
@@ -233,7 +225,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Median Sales Price for New Houses Sold in the United States (MSPNHSUS)
 #     """
-#     series = fred.get_series('MSPNHSUS')
+#     series = get_series('MSPNHSUS')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Median New Home Price']
     
@@ -254,7 +246,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     S&P CoreLogic Case-Shiller U.S. National Home Price Index (CSUSHPINSA)
 #     """
-#     series = fred.get_series('CSUSHPINSA')
+#     series = get_series('CSUSHPINSA')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'CSHI']
 #     df['CSHI'] = round(df['CSHI'], 2)
@@ -276,7 +268,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Expenditures: Household Operations: All Consumer Units (CXUHHOPERLB0101M)
 #     """
-#     series = fred.get_series('CXUHHOPERLB0101M')
+#     series = get_series('CXUHHOPERLB0101M')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Household Ops Annual']
     
@@ -303,7 +295,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     ref_price = 28472
 
 #     #CPI table - resampled to annual on mean
-#     cpi = fred.get_series('CPIAUCSL')
+#     cpi = get_series('CPIAUCSL')
 #     cpi_df = cpi.to_frame().reset_index()
 #     cpi_df.columns = ['Date', 'CPI']
 #     cpi_df['Date'] = pd.to_datetime(cpi_df['Date'])
@@ -313,7 +305,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     cpi_df.reset_index(inplace=True)
 #     cpi_df.columns = ['Year', 'CPI']
 
-#     series = fred.get_series('CUSR0000SETA02')
+#     series = get_series('CUSR0000SETA02')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Used Auto CPI']
     
@@ -343,7 +335,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     ref_price = 48397
 
 #     #CPI table - resampled to annual on mean
-#     cpi = fred.get_series('CPIAUCSL')
+#     cpi = get_series('CPIAUCSL')
 #     cpi_df = cpi.to_frame().reset_index()
 #     cpi_df.columns = ['Date', 'CPI']
 #     cpi_df['Date'] = pd.to_datetime(cpi_df['Date'])
@@ -353,7 +345,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     cpi_df.reset_index(inplace=True)
 #     cpi_df.columns = ['Year', 'CPI']
 
-#     series = fred.get_series('CUUR0000SETA01')
+#     series = get_series('CUUR0000SETA01')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'New Auto CPI']
     
@@ -379,7 +371,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Expenditures: Vehicle Insurance: All Consumer Units (CXU500110LB0101M)
 #     """
-#     series = fred.get_series('CXU500110lB0101M')
+#     series = get_series('CXU500110lB0101M')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Vehicle Ins Annual']
     
@@ -402,7 +394,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     PCE Services: Healthcare (DHLCRC1Q027SBEA).
 #     """
-#     series = fred.get_series('DHLCRC1Q027SBEA')
+#     series = get_series('DHLCRC1Q027SBEA')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'PCE Healthcare']
     
@@ -430,7 +422,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     Frequencies: Monthly - M (default), Quarterly - Q
 #     Default period aggregation is mean.
 #     """
-#     series = fred.get_series('UNRATE')
+#     series = get_series('UNRATE')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Unrate']
     
@@ -459,7 +451,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     Frequencies: Monthly - M (default), Quarterly - Q, Annual - A
 #     Default period aggregation is mean.
 #     """
-#     series = fred.get_series('M2SL')
+#     series = get_series('M2SL')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'M2 Supply']
     
@@ -489,7 +481,7 @@ fred = Fred(api_key=FRED_API_KEY)
 
 #     Frequencies: Quarterly - Q (default), Monthly - M
 #     """
-#     series = fred.get_series('M2V')
+#     series = get_series('M2V')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'M2 Velocity']
     
@@ -515,7 +507,7 @@ fred = Fred(api_key=FRED_API_KEY)
 
 #     Frequencies: Quarterly - Q (default), Monthly - M
 #     """
-#     series = fred.get_series('GDP')
+#     series = get_series('GDP')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'GDP']
 #     df['Date'] = pd.to_datetime(df['Date'])
@@ -546,7 +538,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     Frequencies: Daily - D (default), Weekly - W, Monthly - W, Quarterly - M
 #     Default period aggregation is mean.
 #     """
-#     series = fred.get_series('SOFR')
+#     series = get_series('SOFR')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'SOFR']
     
@@ -578,7 +570,7 @@ fred = Fred(api_key=FRED_API_KEY)
 
 #     Frequencies: Annual - A (default), Monthly - M
 #     """
-#     series = fred.get_series('SPDYNCBRTINUSA')
+#     series = get_series('SPDYNCBRTINUSA')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Births Per 1000']
 
@@ -606,7 +598,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     hoi_ref_year = 2024
 
 #     #CPI table - resampled to annual on mean
-#     cpi = fred.get_series('CPIAUCSL')
+#     cpi = get_series('CPIAUCSL')
 #     cpi_df = cpi.to_frame().reset_index()
 #     cpi_df.columns = ['Date', 'CPI']
 #     cpi_df['Date'] = pd.to_datetime(cpi_df['Date'])
@@ -617,7 +609,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     cpi_df.columns = ['Year', 'CPI']
 
 #     #HOI PPI table - resampled to annual on mean
-#     hoi_series = fred.get_series('PCU9241269241262')
+#     hoi_series = get_series('PCU9241269241262')
 #     hoi_df = hoi_series.to_frame().reset_index()
 #     hoi_df.columns = ['Date', 'HOI PPI']
 #     hoi_df['Date'] = pd.to_datetime(hoi_df['Date'])
@@ -650,7 +642,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     merged_hoi_df['Scaled Premium'] = merged_hoi_df.apply(lambda row: scale_for_inflation(cpi_df, 2024, row['Year'], row['Est HOI Premium']), axis=1)
 
 #     #Median Home Prices DF - resampled to annual as mean
-#     median_home_prices = fred.get_series('MSPUS')
+#     median_home_prices = get_series('MSPUS')
 #     df_home_median_prices = median_home_prices.to_frame().reset_index()
 #     df_home_median_prices.columns = ['Date', 'Median Sales Price']
 #     df_home_median_prices['Date'] = pd.to_datetime(df_home_median_prices['Date'])
@@ -661,7 +653,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     df_home_median_prices_annual.columns = ['Year', 'Median Sales Price']
 
 #     #Median Family Income - annual series
-#     median_family_income = fred.get_series('MEFAINUSA646N')
+#     median_family_income = get_series('MEFAINUSA646N')
 #     df_median_family_income =  median_family_income.to_frame().reset_index()
 #     df_median_family_income.columns = ['Date', 'Median Family Income']
 #     df_median_family_income['Date'] = pd.to_datetime(df_median_family_income['Date'])
@@ -671,7 +663,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     df_median_family_income.columns = ['Year', 'Median Family Income']
 
 #     #30Yr Mortgage Rates - resampled to annual as mean
-#     mtg30 = fred.get_series('MORTGAGE30US')
+#     mtg30 = get_series('MORTGAGE30US')
 #     df_mtg30 = mtg30.to_frame().reset_index()
 #     df_mtg30.columns = ['Date', '30yr Mtg Rate']
 #     df_mtg30['Date'] = pd.to_datetime(df_mtg30['Date'])
@@ -704,7 +696,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Unemployment Level (UNEMPLOY)
 #     """
-#     series = fred.get_series('unemploy')
+#     series = get_series('unemploy')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Unemployed']
 
@@ -730,7 +722,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Job Openings: Total Nonfarm (JTSJOL)
 #     """
-#     series = fred.get_series('JTSJOL')
+#     series = get_series('JTSJOL')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Job Openings']
 
@@ -756,7 +748,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     Federal Funds Effective Rate (FEDFUNDS)
 #     """
-#     series = fred.get_series('FEDFUNDS')
+#     series = get_series('FEDFUNDS')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'Fed Funds Rate']
 
@@ -777,7 +769,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     New Houses for Sale by Stage of Construction, Not Started (NHFSEPNTS)
 #     """
-#     series = fred.get_series('NHFSEPNTS')
+#     series = get_series('NHFSEPNTS')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'New Homes NS']
 
@@ -800,7 +792,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     New Houses for Sale by Stage of Construction, Under Construction (NHFSEPUCS)
 #     """
-#     series = fred.get_series('NHFSEPUCS')
+#     series = get_series('NHFSEPUCS')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'New Homes UC']
 
@@ -823,7 +815,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     """
 #     New Houses for Sale by Stage of Construction, Completed (NHFSEPCS)
 #     """
-#     series = fred.get_series('NHFSEPCS')
+#     series = get_series('NHFSEPCS')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'New Homes Comp']
 
@@ -847,7 +839,7 @@ fred = Fred(api_key=FRED_API_KEY)
 #     New One Family Houses for Sale in the United States (HNFSUSNSA)
 #     Frequency: Monthly (M) - default
 #     """
-#     series = fred.get_series('HNFSUSNSA')
+#     series = get_series('HNFSUSNSA')
 #     df = series.to_frame().reset_index()
 #     df.columns = ['Date', 'New SF Homes']
 
@@ -0,0 +1,236 @@
+import re
+import threading
+from datetime import date
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from pipeline import rolled_up
+from registry import SERIES
+from series_cache import get_stored
+
+# Series every real/nominal conversion is based on
+CPI_SERIES = 'CPIAUCSL'
+
+
+class _Table:
+    """
+    Values laid out in an array indexed by period number (months or years) from the first
+    period, so looking one up is a subtraction and an array read. `observed` marks the periods
+    that have an observation, which may itself be NaN.
+    """
+
+    def __init__(self, periods: np.ndarray, values: np.ndarray):
+        self.first = int(periods.min()) if len(periods) else 0
+        size = int(periods.max()) - self.first + 1 if len(periods) else 0
+        self.values = np.full(size, np.nan)
+        self.observed = np.zeros(size, dtype=bool)
+        self.values[periods - self.first] = values
+        self.observed[periods - self.first] = True
+
+    def positions(self, periods) -> np.ndarray:
+        """
+        Array position of each period, or -1 for periods without an observation.
+        """
+        pos = np.atleast_1d(np.asarray(periods, dtype='int64')) - self.first
+        inside = (pos >= 0) & (pos < len(self.values))
+        inside[inside] = self.observed[pos[inside]]
+        return np.where(inside, pos, -1)
+
+    def gather(self, periods) -> np.ndarray:
+        pos = self.positions(periods)
+        return np.where(pos >= 0, self.values[pos.clip(0)], np.nan)
+
+
+# Period strings `parse_periods` accepts: years, and months numbered 01-12
+_YEAR = re.compile(r'\d{4}')
+_MONTH = re.compile(r'\d{4}-(0[1-9]|1[0-2])')
+
+
+def _invalid(values: np.ndarray, index: int):
+    raise ValueError(f"Unsupported period {values[index]!r} at index {index}; expected a year such as 1980 "
+                     f"or a month such as '1980-06'")
+
+
+def _months(dates) -> np.ndarray:
+    dates = pd.DatetimeIndex(dates)
+    return np.asarray(dates.year * 12 + dates.month - 1, dtype='int64')
+
+
+class Periods(NamedTuple):
+    """
+    Parsed periods: whether each is a year, and its year or month number (year * 12 + month - 1).
+    """
+    is_year: np.ndarray
+    number: np.ndarray
+
+    def label(self, index: int) -> str:
+        number = int(self.number[index])
+        return str(number) if self.is_year[index] else f"{number // 12}-{number % 12 + 1:02d}"
+
+
+def parse_periods(periods) -> Periods:
+    """
+    Read years and months once, for any number of CPI lookups. Integers and 'YYYY' strings
+    are years; dates and 'YYYY-MM' strings are months. Any other period, booleans included,
+    raises ValueError naming it and its index.
+    """
+    if isinstance(periods, Periods):
+        return periods
+    values = np.atleast_1d(periods if isinstance(periods, np.ndarray) else np.asarray(periods, dtype=object))
+    if values.dtype.kind in 'iu':
+        return Periods(np.ones(len(values), dtype=bool), values.astype('int64', copy=False))
+    if values.dtype.kind == 'M':
+        return Periods(np.zeros(len(values), dtype=bool), _months(values))
+    values = values.astype(object, copy=False)
+    if pd.api.types.infer_dtype(values, skipna=False) == 'integer':
+        return Periods(np.ones(len(values), dtype=bool), values.astype('int64'))
+
+    # Batches repeat the same few hundred periods, so only distinct ones are parsed
+    codes, distinct = pd.factorize(values)
+    if (codes < 0).any():
+        _invalid(values, int(np.argmax(codes < 0)))
+    is_year = np.zeros(len(distinct), dtype=bool)
+    number = np.empty(len(distinct), dtype='int64')
+    months, dates = {}, {}
+    for code, period in enumerate(distinct):
+        if isinstance(period, (int, np.integer)) and not isinstance(period, bool):
+            is_year[code], number[code] = True, period
+        elif isinstance(period, str) and _YEAR.fullmatch(period):
+            is_year[code], number[code] = True, int(period)
+        elif isinstance(period, str) and _MONTH.fullmatch(period):
+            months[code] = period
+        elif isinstance(period, (date, np.datetime64)):
+            dates[code] = period
+        else:
+            _invalid(values, int(np.argmax(codes == code)))
+    if months:
+        number[list(months)] = _months(pd.to_datetime(list(months.values()), format='%Y-%m'))
+    if dates:
+        number[list(dates)] = _months(pd.to_datetime(list(dates.values())))
+    return Periods(is_year[codes], number[codes])
+
+
+class Deflator:
+    """
+    CPI held for O(1) lookups: monthly observations indexed by month, and annual rollups
+    indexed by year. Converting between years or months is a gather of two CPI values and a
+    divide, whether for one amount or a whole column.
+    """
+
+    def __init__(self, stored):
+        self._stored = stored
+        series = stored.series
+        self.months = _Table(_months(series.index), series.to_numpy())
+        self._years: dict[str, _Table] = {}
+        self._lock = threading.Lock()
+
+    def years(self, agg: str = 'mean') -> _Table:
+        """
+        Annual CPI aggregated with `agg`, from the rollups precomputed at ingest.
+        """
+        table = self._years.get(agg)
+        if table is None:
+            series = rolled_up(SERIES[CPI_SERIES], self._stored, 'A', agg)
+            table = _Table(np.asarray(series.index.year, dtype='int64'), series.to_numpy())
+            with self._lock:
+                self._years[agg] = table
+        return table
+
+    def annual(self, agg: str = 'mean') -> pd.DataFrame:
+        """
+        Annual CPI as a Year/CPI frame.
+        """
+        table = self.years(agg)
+        pos = np.flatnonzero(table.observed)
+        return pd.DataFrame({'Year': (pos + table.first).astype('int32'), 'CPI': table.values[pos]})
+
+    def matched(self, df: pd.DataFrame, on: str = 'Date') -> tuple[pd.DataFrame, np.ndarray]:
+        """
+        Rows of `df` dated in a month with a CPI observation, and the CPI of each.
+        """
+        pos = self.months.positions(_months(df[on]))
+        found = pos >= 0
+        if not found.all():
+            df = df[found].reset_index(drop=True)
+            pos = pos[found]
+        return df, self.months.values[pos]
+
+    def ratio(self, from_year, to_year, agg: str = 'mean'):
+        """
+        CPI of `to_year` over CPI of `from_year`; either may be an array of years, which gives
+        NaN for years without CPI.
+        """
+        table = self.years(agg)
+        if np.isscalar(from_year) and np.isscalar(to_year):
+            from_pos, to_pos = table.positions([from_year, to_year])
+            if from_pos < 0 or to_pos < 0:
+                raise ValueError(f"No CPI for {from_year if from_pos < 0 else to_year}")
+            return table.values[to_pos] / table.values[from_pos]
+        return table.gather(to_year) / table.gather(from_year)
+
+    def check(self, periods, agg: str = 'mean') -> Periods:
+        """
+        Parsed `periods`, raising ValueError for the first one outside the CPI tables: a year
+        beyond the annual CPI aggregated with `agg`, or a month beyond the monthly series.
+        """
+        periods = parse_periods(periods)
+        for table, mask in ((self.years(agg), periods.is_year), (self.months, ~periods.is_year)):
+            last = table.first + len(table.values) - 1
+            outside = mask & ((periods.number < table.first) | (periods.number > last))
+            if outside.any():
+                index = int(np.argmax(outside))
+                bounds = Periods(np.full(2, periods.is_year[index]), np.array([table.first, last]))
+                raise ValueError(f"No CPI for {periods.label(index)} at index {index}; "
+                                 f"CPI covers {bounds.label(0)} to {bounds.label(1)}")
+        return periods
+
+    def at(self, periods, agg: str = 'mean') -> np.ndarray:
+        """
+        CPI at each period, NaN where there is none. Periods are read by `parse_periods`,
+        unless already parsed: years take annual CPI aggregated with `agg`, months the
+        monthly observation.
+        """
+        is_year, number = parse_periods(periods)
+        if is_year.all():
+            return self.years(agg).gather(number)
+        if not is_year.any():
+            return self.months.gather(number)
+        cpi = np.empty(len(number))
+        cpi[is_year] = self.years(agg).gather(number[is_year])
+        cpi[~is_year] = self.months.gather(number[~is_year])
+        return cpi
+
+    def convert(self, amounts, from_periods, to_periods, agg: str = 'mean') -> np.ndarray:
+        """
+        Each amount in its `from_periods` dollars expressed in `to_periods` dollars, rounded to
+        cents, in one vectorized pass. Periods are as for `at`; a single period applies to
+        every amount, and amounts with no CPI for either period give NaN.
+        """
+        ratio = self.at(to_periods, agg) / self.at(from_periods, agg)
+        return np.round(np.asarray(amounts, dtype='float64') * ratio, 2)
+
+    def scale(self, amount, from_year, to_year, agg: str = 'mean'):
+        """
+        `amount` in `from_year` dollars expressed in `to_year` dollars, rounded to cents.
+        """
+        return np.round(amount * self.ratio(from_year, to_year, agg), 2)
+
+
+_current: tuple | None = None
+_current_lock = threading.Lock()
+
+
+def cpi_deflator() -> Deflator:
+    """
+    The shared deflator for the CPI series currently cached, rebuilt only once CPI changes.
+    """
+    global _current
+    stored = get_stored(CPI_SERIES)
+    version = (stored.last_updated, stored.coverage_start, stored.coverage_end, len(stored.series))
+    current = _current
+    if current is not None and current[0] == version:
+        return current[1]
+    deflator = Deflator(stored)
+    with _current_lock:
+        _current = (version, deflator)
+    return deflator
@@ -0,0 +1,72 @@
+"""
+Response formats dataset routes can produce, and negotiation of them from Accept headers.
+"""
+
+FORMATS = ('records', 'columns', 'split', 'compact', 'arrow', 'parquet', 'csv', 'ndjson')
+
+# Media types of the formats that aren't JSON documents
+MEDIA_TYPES = {
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Formats sent as a chunked stream rather than one body (see serialization.STREAMERS)
+STREAMED = ('csv', 'ndjson')
+
+# Accept header media types and the format they select (None = JSON)
+ACCEPTED = {
+    'application/vnd.apache.arrow.stream': 'arrow',
+    'application/vnd.apache.parquet': 'parquet',
+    'application/x-parquet': 'parquet',
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/json': None,
+    'application/*': None,
+    '*/*': None,
+}
+
+
+def normalize_format(format: str | None) -> str | None:
+    if format is None:
+        return None
+    format = format.strip().lower()
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported format '{format}'; expected one of {', '.join(FORMATS)}")
+    return format
+
+
+def quality_values(header: str | None) -> list[tuple[str, float]]:
+    """
+    The values listed in an Accept-style header with their q-values, most preferred first.
+    Values with q=0 are left out; ties keep the order they were listed in.
+    """
+    if not header:
+        return []
+    ranges = []
+    for i, part in enumerate(header.split(",")):
+        value, *params = [item.strip() for item in part.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        if value and q > 0:
+            ranges.append((-q, i, value.lower()))
+    return [(value, -q) for q, _, value in sorted(ranges)]
+
+
+def negotiate(accept: str | None) -> str | None:
+    """
+    The non-JSON format an Accept header prefers, or None when JSON is preferred, acceptable
+    or nothing in the header is supported.
+    """
+    for media_type, _ in quality_values(accept):
+        if media_type in ACCEPTED:
+            return ACCEPTED[media_type]
+    return None
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+# How `align` treats keys missing from some inputs
+HOWS = ('inner', 'outer', 'asof')
+
+
+def _searchable(values: np.ndarray) -> np.ndarray:
+    # Dates are searched as their int64 nanoseconds, which numpy compares much faster
+    if values.dtype.kind == 'M':
+        return values.astype('datetime64[ns]', copy=False).view('i8')
+    return values
+
+
+class _Keys:
+    """
+    A frame's key column as a sorted array, with the order that sorts it when it wasn't already.
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.dates = values.dtype.kind == 'M'
+        values = _searchable(values)
+        self.order = None
+        if len(values) > 1 and not (values[1:] > values[:-1]).all():
+            self.order = np.argsort(values, kind='stable')
+            values = values[self.order]
+        self.values = values
+
+    @property
+    def unique(self) -> bool:
+        return self.order is None or bool((self.values[1:] > self.values[:-1]).all())
+
+    def rows(self, keys: np.ndarray, asof: bool = False, tolerance=None) -> np.ndarray:
+        """
+        Row of the frame holding each of `keys` (or with `asof`, the latest key at or before
+        it, at most `tolerance` back), or -1 if there is none.
+        """
+        if asof:
+            pos = self.values.searchsorted(keys, side='right') - 1
+            found = pos >= 0
+            if tolerance is not None and len(self.values):
+                limit = pd.Timedelta(tolerance).value if self.dates else tolerance
+                found &= keys - self.values[pos.clip(0)] <= limit
+        else:
+            pos = self.values.searchsorted(keys, side='left')
+            found = pos < len(self.values)
+            found[found] = self.values[pos[found]] == keys[found]
+        rows = pos if self.order is None else self.order[pos.clip(0, max(len(self.values) - 1, 0))]
+        return np.where(found, rows, -1)
+
+
+def _take(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    `values` at `rows`, with missing values where a row is -1.
+    """
+    missing = rows < 0
+    values = values[rows.clip(0)] if len(values) else np.empty(len(rows), dtype=values.dtype)
+    if missing.any():
+        if values.dtype.kind in 'iub':
+            values = values.astype('float64')
+        values[missing] = np.datetime64('NaT') if values.dtype.kind in 'mM' else np.nan
+    return values
+
+
+def align(frames: list[pd.DataFrame], on: str = 'Date', how: str = 'inner', tolerance=None) -> pd.DataFrame:
+    """
+    Join frames on their `on` column in one operation: the sorted union (`outer`) or
+    intersection (`inner`) of keys is computed once, and every column is taken straight onto
+    it by binary search, instead of merging the frames pairwise. With `asof`, rows follow the
+    first frame and the others contribute their latest row at or before each key, at most
+    `tolerance` back.
+
+    Keys must be unique within a frame and value columns unique across frames. The key comes
+    first, then each frame's columns in order.
+    """
+    if how not in HOWS:
+        raise ValueError(f"Unsupported join '{how}'; expected one of {', '.join(HOWS)}")
+    if not frames:
+        raise ValueError("No DataFrames to join.")
+
+    keys, seen = [], {on}
+    for i, df in enumerate(frames):
+        if on not in df.columns:
+            raise ValueError(f"DataFrame at index {i} is missing '{on}' column.")
+        overlap = seen.intersection(df.columns) - {on}
+        if overlap:
+            raise ValueError(f"DataFrame at index {i} repeats column(s) {', '.join(sorted(overlap))}.")
+        seen.update(df.columns)
+        key = _Keys(df[on].to_numpy())
+        if not key.unique:
+            raise ValueError(f"DataFrame at index {i} has duplicate '{on}' values.")
+        keys.append(key)
+
+    if how == 'asof':
+        joined = _searchable(frames[0][on].to_numpy())
+    elif how == 'outer':
+        joined = np.unique(np.concatenate([key.values for key in keys]))
+    else:
+        joined = keys[0].values
+        for key in keys[1:]:
+            joined = joined[key.rows(joined) >= 0]
+
+    columns = {on: joined.view('datetime64[ns]') if keys[0].dates else joined}
+    for i, (df, key) in enumerate(zip(frames, keys)):
+        rows = None
+        if not (i == 0 and how == 'asof' or len(df) == len(joined) and key.order is None and np.array_equal(key.values, joined)):
+            rows = key.rows(joined, asof=how == 'asof' and i > 0, tolerance=tolerance)
+        for col in df.columns.drop(on):
+            values = df[col].to_numpy()
+            columns[col] = values if rows is None else _take(values, rows)
+    return pd.DataFrame(columns)
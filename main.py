@@ -1,7 +1,21 @@
-from fastapi import FastAPI, HTTPException, Query
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from pydantic import BaseModel, Field, StrictInt
 from fastapi.responses import JSONResponse
 import pandas as pd
-from utils import sanitize_for_json
+from serialization import DataFrameResponse
+from formats import FORMATS, normalize_format
+from deflator import parse_periods
+from conditional import ConditionalGetMiddleware
+from compress import CompressionMiddleware, bodies
+import series_cache
+from series_cache import CACHE_ADMIN_TOKEN, afetch
+from registry import ROUTES, SERIES, SeriesSpec
+from pipeline import FETCHERS, JOINS, panel
+from scheduler import BACKGROUND_REFRESH, scheduler
+from warmup import WARMUP_ON_STARTUP, warmup
+from resample import rollups
+import hmac
 import inspect
 import categories.demographics as demographics
 import categories.housing as housing
@@ -29,7 +43,36 @@ modules = {
 }
 
 
-app = FastAPI(title="GovData API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # With background refresh on, the scheduler owns upstream syncs and requests only read local data
+    if BACKGROUND_REFRESH:
+        series_cache.cache.read_through = False
+        scheduler.start()
+    # Warm-up runs in the background; /ready reports 503 until it's done
+    if WARMUP_ON_STARTUP:
+        warmup.start(modules, app.routes)
+    yield
+    await warmup.stop()
+    scheduler.stop()
+    series_cache.fred.close()
+    await series_cache.afred.aclose()
+
+
+app = FastAPI(title="GovData API", version="0.1.0", lifespan=lifespan)
+app.add_middleware(ConditionalGetMiddleware)
+# Added last so it wraps the conditional middleware and sees the ETag it sets
+app.add_middleware(CompressionMiddleware)
+
+
+def response_format(
+    format: str | None = Query(None, description=f"Response format ({', '.join(FORMATS)}); by default negotiated from Accept")
+) -> str | None:
+    """The `format` query parameter of dataset routes, rejected with 400 before any data is fetched."""
+    try:
+        return normalize_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/")
@@ -46,719 +89,262 @@ def root():
     return {"message": "GovData API", "available_datasets": categorized}
 
 
-@app.get("/cpi")
-def get_cpi(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-):
-    """Consumer Price Index for All Urban Consumers (CPIAUCSL)."""
-    try: 
-        df:pd.DataFrame = inflation_and_prices._fetch_cpi(start_date=start_date, end_date=end_date)
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/cache/stats")
+def get_cache_stats():
+    """Hit/miss counters and entry TTLs for the shared FRED series cache, resampled rollups and response bodies."""
+    return {**series_cache.cache_stats(), "rollups": rollups.stats(), "bodies": bodies.stats()}
 
 
-@app.get("/scale-for-inflation")
-def scale_for_inflation_route(
-    from_year: int = Query(1980, description="Year to scale from"),
-    to_year: int = Query(2025, description="Year to scale to"),
-    amount: float = Query(100.0, description="Amount to scale")
-):
-    """
-    Scale a monetary amount from `from_year` to `to_year` using CPI data.
-    """
-    scaled_value = inflation_and_prices._fetch_scaled_with_cpi(from_year=from_year, to_year=to_year, amount=amount)
-    return {"from_year": from_year, "to_year": to_year, "original_amount": amount, "scaled_amount": scaled_value}
+def require_admin_token(x_admin_token: str | None = Header(None, description="Must match CACHE_ADMIN_TOKEN")):
+    """Admin routes are off unless CACHE_ADMIN_TOKEN is set, and then need it in X-Admin-Token."""
+    if CACHE_ADMIN_TOKEN is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), CACHE_ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
 
 
-@app.get("/pce")
-def get_pce(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)")
+@app.post("/cache/invalidate", dependencies=[Depends(require_admin_token)], include_in_schema=CACHE_ADMIN_TOKEN is not None)
+def invalidate_cache(
+    series_id: str | None = Query(None, description="FRED series ID to drop (omit to clear the whole cache)"),
 ):
-    """Consumer Price Index for All Urban Consumers (CPIAUCSL)."""
-    try: 
-        df:pd.DataFrame = inflation_and_prices._fetch_pce(start_date=start_date, end_date=end_date) 
+    """Drop cached FRED series so the next request refetches them upstream. Requires the X-Admin-Token header."""
+    removed = series_cache.invalidate(series_id)
+    return {"series_id": series_id, "invalidated": removed}
 
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/scheduler/status")
+def get_scheduler_status():
+    """Refresh schedule and last-run status for every series kept current by the background scheduler."""
+    return scheduler.status()
 
-@app.get("/households")
-def get_households(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)")
-):
-    """Total Households (TTLHH)"""
-    try: 
-        df:pd.DataFrame = demographics._fetch_us_households(start_date=start_date, end_date=end_date)
 
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.get("/ready")
+def get_ready():
+    """Readiness probe: 503 until the startup warm-up (if enabled) has finished."""
+    status = warmup.status()
+    return JSONResponse(content=status, status_code=200 if status["ready"] else 503)
 
 
-@app.get("/population")
-def get_population(
+@app.get("/series")
+async def get_series_panel(
+    ids: str = Query(..., description="Comma-separated registered FRED series IDs, e.g. CPIAUCSL,UNRATE,FEDFUNDS"),
     start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)")
+    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
+    freq: str | None = Query(None, description="Frequency period (D, W, M, Q, A); defaults to the coarsest default of the requested series"),
+    agg: str | None = Query(None, description="Aggregation when resampling (mean, last, max, min, sum, ffill)"),
+    join: str = Query("outer", description=f"Keep dates present in any series or only in all of them ({', '.join(JOINS)})"),
+    format: str | None = Depends(response_format)
 ):
-    """Total Households (TTLHH)"""
-    try: 
-        df:pd.DataFrame = demographics._fetch_us_population(start_date=start_date, end_date=end_date)
+    """Any registered series aligned on a shared Date column in one response, one column per series ID."""
+    series_ids = tuple(dict.fromkeys(s.strip().upper() for s in ids.split(",") if s.strip()))
+    if not series_ids:
+        raise HTTPException(status_code=400, detail="No series IDs given")
+    unknown = [s for s in series_ids if s not in SERIES]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown series: {', '.join(unknown)}")
+    try:
+        df:pd.DataFrame = await afetch(panel, series_ids=series_ids, start_date=start_date, end_date=end_date, freq=freq, agg=agg, join=join)
 
-        return JSONResponse(content=sanitize_for_json(df))
+        return DataFrameResponse(df, format=format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/median-family-income")
-def get_median_income(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)")
-):
+def series_route(spec: SeriesSpec):
     """
-    Median Annual Family Income in the United States (MEFAINUSA646N)
+    Route handler for a registered series: its fetch function through `afetch`, resampled
+    on request and documented by the function's docstring.
     """
-    try: 
-        df:pd.DataFrame = income_and_spending._fetch_median_family_income(start_date=start_date, end_date=end_date)
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    fetch = FETCHERS[spec.fred_id]
+    default_freq = spec.default_freq or spec.native_freq
 
+    async def route(
+        start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
+        end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
+        freq: str | None = Query(None, description=f"Frequency period (D, W, M, Q, A); {default_freq} by default"),
+        agg: str | None = Query(None, description="Aggregation when resampling (mean, last, max, min, sum, ffill)"),
+        format: str | None = Depends(response_format)
+    ):
+        try:
+            df:pd.DataFrame = await afetch(fetch, start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-@app.get("/mortgage-30yr")
-def get_30yr_mortgage_rates(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('A', description="Frequency period")
-):
-    """
-    30-Year Fixed Rate Mortgage Average in the United States (MORTGAGE30US)
-    """
-    try: 
-        df:pd.DataFrame = rates._fetch_30yr_mortgage_rates(start_date=start_date, end_date=end_date, freq=freq)
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+            return DataFrameResponse(df, format=format)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
+    route.__name__ = fetch.__name__.replace("_fetch_", "get_", 1)
+    route.__doc__ = fetch.__doc__
+    return route
 
-@app.get("/mortgage-15yr")
-def get_15yr_mortgage_rates(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('A', description="Frequency period")
-):
-    """
-    15-Year Fixed Rate Mortgage Average in the United States (MORTGAGE15US)
-    """
-    try: 
-        df:pd.DataFrame = rates._fetch_15yr_mortgage_rates(start_date=start_date, end_date=end_date, freq=freq)
 
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+# Every single-series dataset route comes from the registry
+for path, spec in ROUTES.items():
+    app.get(path)(series_route(spec))
 
 
-@app.get("/mortgage-all")
-def get_all_mortgage_rates(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('A', description="Frequency period")
+@app.get("/scale-for-inflation")
+async def scale_for_inflation_route(
+    from_year: int = Query(1980, description="Year to scale from"),
+    to_year: int = Query(2025, description="Year to scale to"),
+    amount: float = Query(100.0, description="Amount to scale")
 ):
     """
-    Fetch both 30-year and 15-year mortgage rates and merge them into a single DataFrame.
+    Scale a monetary amount from `from_year` to `to_year` using CPI data.
     """
-    try: 
-        df:pd.DataFrame = rates._fetch_all_mortgage_rates(start_date=start_date, end_date=end_date, freq=freq)
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
+    try:
+        scaled_value = await afetch(inflation_and_prices._fetch_scaled_with_cpi, from_year=from_year, to_year=to_year, amount=amount)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"from_year": from_year, "to_year": to_year, "original_amount": amount, "scaled_amount": scaled_value}
 
-@app.get("/rdpi")
-def get_rdpi(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)")
-):
-    """
-    Real Disposable Personal Income (DSPI)
-    """
-    try: 
-        df:pd.DataFrame = income_and_spending._fetch_median_family_income(start_date=start_date, end_date=end_date)
 
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+class ScaleBatch(BaseModel):
+    amounts: list[float] = Field(..., description="Amounts to scale")
+    from_periods: list[StrictInt | str] | StrictInt | str = Field(..., description="Year (e.g. 1980) or month (e.g. '1980-06') of each amount, or one period for all of them")
+    to_periods: list[StrictInt | str] | StrictInt | str = Field(..., description="Year or month to scale each amount to, or one period for all of them")
 
 
-@app.get("/mspus")
-def get_mspus(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)")
+@app.post("/scale-for-inflation/batch")
+async def scale_for_inflation_batch_route(
+    batch: ScaleBatch,
+    format: str | None = Depends(response_format)
 ):
     """
-    Median Sales Price of Houses Sold for the United States (MSPUS)
+    Scale many amounts at once, each between its own years (annual mean CPI) or months (monthly CPI).
+    Periods outside the CPI series are rejected; amounts with a gap in CPI for either period come back as null.
     """
-    try: 
-        df:pd.DataFrame = housing._fetch_median_home_prices(start_date=start_date, end_date=end_date)
+    # Periods are parsed once here; the conversion reuses the parsed arrays
+    parsed = {}
+    for name in ("from_periods", "to_periods"):
+        periods = getattr(batch, name)
+        if isinstance(periods, list) and len(periods) != len(batch.amounts):
+            raise HTTPException(status_code=400, detail=f"{name} has {len(periods)} values for {len(batch.amounts)} amounts")
+        try:
+            parsed[name] = parse_periods(periods)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"{name}: {e}")
+    try:
+        df:pd.DataFrame = await afetch(inflation_and_prices._fetch_scaled_batch_with_cpi, amounts=batch.amounts,
+                                       from_periods=parsed["from_periods"], to_periods=parsed["to_periods"])
 
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return DataFrameResponse(df, format=format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.get("/mspnus")
-def get_msp_new_homes(
+@app.get("/mortgage-all")
+async def get_all_mortgage_rates(
     start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)")
+    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
+    freq: str | None = Query(None, description="Frequency period (W, M, Q, A); weekly by default"),
+    agg: str | None = Query(None, description="Aggregation when resampling (mean, last, max, min, sum, ffill)"),
+    format: str | None = Depends(response_format)
 ):
     """
-    Median Sales Price for New Houses Sold in the United States (MSPNHSUS)
+    Fetch both 30-year and 15-year mortgage rates and merge them into a single DataFrame.
     """
     try: 
-        df:pd.DataFrame = housing._fetch_median_home_prices(start_date=start_date, end_date=end_date)
+        df:pd.DataFrame = await afetch(rates._fetch_all_mortgage_rates, start_date=start_date, end_date=end_date, freq=freq, agg=agg)
 
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/cshi")
-def get_caseshiller_homes_index(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-):
-    """S&P CoreLogic Case-Shiller U.S. National Home Price Index (CSUSHPINSA)"""
-    try: 
-        df:pd.DataFrame = housing._fetch_caseshiller_home_price_index(start_date=start_date, end_date=end_date) 
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/hh-ops")
-def get_household_ops(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-):
-    """Expenditures: Household Operations: All Consumer Units (CXUHHOPERLB0101M)"""
-    try: 
-        df:pd.DataFrame = income_and_spending._fetch_houshold_ops_spend(start_date=start_date, end_date=end_date) 
-
-        return JSONResponse(content=sanitize_for_json(df))
+        return DataFrameResponse(df, format=format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/used-cars")
-def get_used_car_prices(
+async def get_used_car_prices(
     start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
     end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
+    format: str | None = Depends(response_format)
 ):
     """CPI Used Cars and Trucks (CUSR0000SETA02). Prices calculated based on CPI index applied to reference year and price"""
     try: 
-        df:pd.DataFrame = inflation_and_prices._fetch_used_car_prices(start_date=start_date, end_date=end_date) 
+        df:pd.DataFrame = await afetch(inflation_and_prices._fetch_used_car_prices, start_date=start_date, end_date=end_date) 
 
-        return JSONResponse(content=sanitize_for_json(df))
+        return DataFrameResponse(df, format=format)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/new-cars")
-def get_new_car_prices(
+async def get_new_car_prices(
     start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
     end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
+    format: str | None = Depends(response_format)
 ):
     """CPI New Cars and Trucks (CUUR0000SETA01). Prices calculated based on CPI index applied to reference year and price"""
     try: 
-        df:pd.DataFrame = inflation_and_prices._fetch_new_car_prices(start_date=start_date, end_date=end_date) 
+        df:pd.DataFrame = await afetch(inflation_and_prices._fetch_new_car_prices, start_date=start_date, end_date=end_date) 
 
-        return JSONResponse(content=sanitize_for_json(df))
+        return DataFrameResponse(df, format=format)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/all-car-prices")
-def get_all_car_prices(
+async def get_all_car_prices(
     start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
     end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
+    format: str | None = Depends(response_format)
 ):
     """Merged dataset with New Car CPI (CUUR0000SETA01) and Used Car CPI (CUSR0000SETA02). Prices calculated based on CPI indices for New and Used autos applied to reference years and prices"""
     try: 
-        df:pd.DataFrame = inflation_and_prices._fetch_all_car_prices(start_date=start_date, end_date=end_date)
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/vehicle-insurance")
-def get_vehicle_ins_premiums(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-):
-    """Expenditures: Vehicle Insurance: All Consumer Units (CXU500110LB0101M)"""
-    try: 
-        df:pd.DataFrame = income_and_spending._fetch_vehicle_ins_premiums(start_date=start_date, end_date=end_date) 
+        df:pd.DataFrame = await afetch(inflation_and_prices._fetch_all_car_prices, start_date=start_date, end_date=end_date)
 
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/pce-healthcare")
-def get_pce_healthcare(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-):
-    """PCE Services: Healthcare (DHLCRC1Q027SBEA)."""
-    try: 
-        df:pd.DataFrame = income_and_spending._fetch_pce_healthcare(start_date=start_date, end_date=end_date) 
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/unrate")
-def get_unrate(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq: str = Query(None, description="Frequency period")
-):
-    """Unemployment Rate (UNRATE)"""
-    try: 
-        df:pd.DataFrame = wages_and_employment._fetch_unrate(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/m2-supply")
-def get_m2_supply(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq: str = Query(None, description="Frequency period")
-):
-    """M2 (WM2NS)"""
-    try: 
-        df:pd.DataFrame = money_aggregates._fetch_m2_supply(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/m2-velocity")
-def get_m2_velocity(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq: str = Query(None, description="Frequency period")
-):
-    """Velocity of M2 Money Stock (M2V)"""
-    try: 
-        df:pd.DataFrame = money_aggregates._fetch_m2_velocity(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/gdp")
-def get_gdp(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq: str = Query(None, description="Frequency period")
-):
-    """Gross Domestic Product (GDP)"""
-    try: 
-        df:pd.DataFrame = output_and_growth._fetch_gdp(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/sofr")
-def get_sofr(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query(None, description="Frequency Period")
-):
-    """Secured Overnight Financing Rate (SOFR)"""
-    try: 
-        df:pd.DataFrame = rates._fetch_sofr(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/us-birthrate")
-def get_us_birthrate(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('A', description="Frequency period")
-):
-    """Crude Birth Rate for the United States (SPDYNCBRTINUSA)"""
-    try: 
-        df:pd.DataFrame = demographics._fetch_us_birthrate(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
+        return DataFrameResponse(df, format=format)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/home-affordability")
-def get_home_affordability(
+async def get_home_affordability(
     start_year: int | None = Query(None, description="Filter start year (YYYY)"),
     end_year: int | None = Query(None, description="Filter end year (YYYY)"),
+    format: str | None = Depends(response_format)
 ):
     """
     Merged Report exploring prices and premiums of buying a home over the years.
     """
     try: 
-        df:pd.DataFrame = income_and_spending._fetch_build_home_affordability(start_year=start_year, end_year=end_year)   
+        df:pd.DataFrame = await afetch(income_and_spending._fetch_build_home_affordability, start_year=start_year, end_year=end_year)   
 
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/unemployed")
-def get_unemployed(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Unemployment Level (UNEMPLOY) as count of Unemployed"""
-    try: 
-        df:pd.DataFrame = wages_and_employment._fetch_unemployment_level(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/job-openings")
-def get_job_openings(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Job Openings: Total Nonfarm (JTSJOL)"""
-    try: 
-        df:pd.DataFrame = wages_and_employment._fetch_job_openings(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/fed-funds")
-def get_fed_funds_rate(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Federal Funds Effective Rate (FEDFUNDS)"""
-    try: 
-        df:pd.DataFrame = rates._fetch_fed_funds_rate(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-# New Houses for Sale by Stage of Construction, Not Started (NHFSEPNTS)
-@app.get("/new-homes-ns")
-def get_new_homes_ns(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """New Houses for Sale by Stage of Construction, Not Started (NHFSEPNTS)"""
-    try: 
-        df:pd.DataFrame = housing._fetch_new_homes_ns(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    
-
-@app.get("/new-homes-uc")
-def get_new_homes_uc(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """New Houses for Sale (Units) by Stage of Construction, Under Construction (NHFSEPUCS)"""
-    try: 
-        df:pd.DataFrame = housing._fetch_new_homes_uc(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/new-homes-comp")
-def get_new_homes_comp(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """New Houses for Sale (Units) by Stage of Construction, Under Construction (NHFSEPUCS)"""
-    try: 
-        df:pd.DataFrame = housing._fetch_new_homes_comp(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/new-sf-homes-for-sale")
-def get_new_sf_homes_for_sale(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """New One Family Houses for Sale in the United States (HNFSUSNSA)"""
-    try: 
-        df:pd.DataFrame = housing._fetch_new_sf_homes_for_sale(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
+        return DataFrameResponse(df, format=format)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/us-births-deaths-by-race")
-def get_birth_death_data(
+async def get_birth_death_data(
     start_year: int | None = Query(None, description="Filter start year (e.g. 2000)"),
     end_year: int | None = Query(None, description="Filter end year (e.g. 2023)"),
-    race: str | None = Query(None, description="Race/Ethnicity filter ('All', 'White', 'Black', 'Hispanic')")
+    race: str | None = Query(None, description="Race/Ethnicity filter ('All', 'White', 'Black', 'Hispanic')"),
+    format: str | None = Depends(response_format)
 ):
     """Births and Deaths by Race/Ethnicity (CDC)"""
     try:
-        df: pd.DataFrame = demographics._fetch_birth_death_data(start_year=start_year, end_year=end_year, race=race)
-        return JSONResponse(content=df.to_dict(orient="records"))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/dq-credit-cards")
-def get_dq_credit_cards(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('Q', description="Frequency period")
-):
-    """Delinquency Rate on Credit Card Loans, All Commercial Banks (DRCCLACBS)"""
-    try: 
-        df:pd.DataFrame = dq._fetch_dq_credit_cards(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    
-
-@app.get("/dq-consumer-loans")
-def get_dq_consumer_loans(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('Q', description="Frequency period")
-):
-    """Delinquency Rate on Consumer Loans, All Commercial Banks (DRCLACBS)"""
-    try: 
-        df:pd.DataFrame = dq._fetch_dq_consumer_loans(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/dq-sfr-mtg")
-def get_dq_sfr_mortgages(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('Q', description="Frequency period")
-):
-    """Delinquency Rate on Single-Family Residential Mortgages, Booked in Domestic Offices, All Commercial Banks (DRSFRMACBS)"""
-    try: 
-        df:pd.DataFrame = dq._fetch_dq_sfr_mortgages(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/dq-all-loans")
-def get_dq_all_loans(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('Q', description="Frequency period")
-):
-    """Delinquency Rate on All Loans, All Commercial Banks (DRALACBS)"""
-    try: 
-        df:pd.DataFrame = dq._fetch_dq_all_loans(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/egg-prices")
-def get_egg_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Eggs, Grade A, Large (Cost per Dozen) in U.S. City Average (APU0000708111)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_egg_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/milk-prices")
-def get_milk_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Milk, Fresh, Whole, Fortified (Cost per Gallon/3.8 Liters) in U.S. City Average (APU0000709112)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_milk_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/ground-beef-prices")
-def get_ground_beef_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Ground Beef, 100% Beef (Cost per Pound/453.6 Grams) in U.S. City Average (APU0000703112)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_ground_beef_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/bread-prices")
-def get_bread_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Bread, White, Pan (Cost per Pound/453.6 Grams) in U.S. City Average (APU0000702111)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_bread_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/chicken-prices")
-def get_chicken_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Chicken Breast, Boneless (Cost per Pound/453.6 Grams) in U.S. City Average (APU0000FF1101)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_chicken_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    
-
-@app.get("/gas-prices")
-def get_gas_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Gasoline, Unleaded Regular (Cost per Gallon/3.785 Liters) in U.S. City Average (APU000074714)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_gas_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/electric-kwh-prices")
-def get_electric_kwh_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Electricity per Kilowatt-Hour in U.S. City Average (APU000072610)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_electric_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.get("/coffee-prices")
-def get_coffee_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Coffee, 100%, Ground Roast, All Sizes (Cost per Pound/453.6 Grams) in U.S. City Average (APU0000717311)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_coffee_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    
-
-@app.get("/bacon-prices")
-def get_bacon_prices(
-    start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
-    end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
-):
-    """Average Price: Bacon, Sliced (Cost per Pound/453.6 Grams) in U.S. City Average (APU0000704111)"""
-    try: 
-        df:pd.DataFrame = commodities._fetch_bacon_sliced_prices(start_date=start_date, end_date=end_date, freq=freq)   
-
-        return JSONResponse(content=sanitize_for_json(df))
+        df: pd.DataFrame = await afetch(demographics._fetch_birth_death_data, start_year=start_year, end_year=end_year, race=race)
+        return DataFrameResponse(df, format=format)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/all-commodity-prices")
-def get_all_commodity_prices(
+async def get_all_commodity_prices(
     start_date: str | None = Query(None, description="Filter start date (YYYY-MM-DD)"),
     end_date: str | None = Query(None, description="Filter end date (YYYY-MM-DD)"),
-    freq:str = Query('M', description="Frequency period")
+    freq:str = Query('M', description="Frequency period"),
+    format: str | None = Depends(response_format)
 ):
     """Aggregated Dataset with Average Price:  All Commodities available in API"""
     try: 
-        df:pd.DataFrame = commodities._fetch_all_commodity_prices(start_date=start_date, end_date=end_date)   
+        df:pd.DataFrame = await afetch(commodities._fetch_all_commodity_prices, start_date=start_date, end_date=end_date)   
 
-        return JSONResponse(content=sanitize_for_json(df))
+        return DataFrameResponse(df, format=format)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
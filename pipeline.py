@@ -0,0 +1,217 @@
+import functools
+from collections.abc import Callable
+import pandas as pd
+from registry import SERIES, SeriesSpec
+from resample import FREQUENCY_RANKS, default_agg, normalize_agg, normalize_freq, period_slice, relabel, resample, rollups, window
+from series_cache import get_series, get_stored, uses_series
+
+
+def date_slice(series:pd.Series, start_date:str=None, end_date:str=None) -> pd.Series:
+    """
+    Observations between `start_date` and `end_date` inclusive, located by binary search on
+    the sorted DatetimeIndex instead of scanning the whole series.
+    """
+    index = series.index
+    lo = index.searchsorted(pd.Timestamp(start_date), side='left') if start_date is not None else 0
+    hi = index.searchsorted(pd.Timestamp(end_date), side='right') if end_date is not None else len(index)
+    return series.iloc[lo:hi]
+
+
+def frame_slice(df:pd.DataFrame, start_date:str=None, end_date:str=None, on:str='Date') -> pd.DataFrame:
+    """
+    Rows whose sorted `on` column falls between `start_date` and `end_date` inclusive, located
+    by binary search like `date_slice`.
+    """
+    dates = df[on]
+    lo = dates.searchsorted(pd.Timestamp(start_date), side='left') if start_date is not None else 0
+    hi = dates.searchsorted(pd.Timestamp(end_date), side='right') if end_date is not None else len(dates)
+    return df.iloc[lo:hi]
+
+
+def resolve(spec:SeriesSpec, freq:str=None, agg:str=None) -> tuple[str, str]:
+    """
+    Output frequency and aggregation for a request, falling back to the spec's defaults.
+    """
+    freq = normalize_freq(freq) or spec.default_freq or spec.native_freq
+    agg = normalize_agg(agg) or default_agg(spec.native_freq, freq, spec.agg)
+    return freq, agg
+
+
+def rollup(spec:SeriesSpec, series:pd.Series, freq:str, agg:str) -> pd.Series:
+    """
+    Shift a series per its spec and resample it to `freq`.
+    """
+    if spec.shift_days:
+        series = pd.Series(series.to_numpy(), index=series.index + pd.Timedelta(days=spec.shift_days))
+    return resample(series, spec.native_freq, freq, agg)
+
+
+def rolled_up(spec:SeriesSpec, stored, freq:str, agg:str) -> pd.Series:
+    """
+    A stored series at `freq`: the series itself at its native frequency, the rollup
+    precomputed at ingest when there is one, or else a resample memoized until the data changes.
+    """
+    if freq == spec.native_freq and not spec.shift_days:
+        return stored.series
+    if not spec.shift_days:
+        level = stored.rollup(freq, agg)
+        if level is not None:
+            return level
+    version = (stored.last_updated, stored.coverage_start, stored.coverage_end, len(stored.series))
+    return rollups.get((spec.fred_id, freq, agg), version, lambda: rollup(spec, stored.series, freq, agg))
+
+
+def scaled(spec:SeriesSpec, series:pd.Series, start_date:str=None, end_date:str=None, freq:str=None) -> pd.Series:
+    """
+    Slice an already rolled-up series to the requested range, then round and scale it.
+    """
+    if freq == spec.native_freq:
+        series = date_slice(series, start_date, end_date)
+    else:
+        series = period_slice(series, freq, start_date, end_date)
+
+    if spec.rounding is not None:
+        series = series.round(spec.rounding)
+    if spec.multiplier is not None:
+        series = series * spec.multiplier
+    return series
+
+
+def build(spec:SeriesSpec, series:pd.Series, start_date:str=None, end_date:str=None, freq:str=None,
+          date_parts:bool=None) -> pd.DataFrame:
+    """
+    Slice, round and scale an already rolled-up series, then build the output frame. Every
+    step works on the whole column at once.
+
+    Date is left as datetime64 and formatted at serialization. Year/Month/Day are added
+    per the spec unless `date_parts` says otherwise.
+    """
+    series = scaled(spec, series, start_date, end_date, freq)
+
+    dates = series.index
+    df = pd.DataFrame({'Date': dates, spec.column: series.to_numpy()})
+    if spec.date_parts if date_parts is None else date_parts:
+        df['Year'] = dates.year
+        df['Month'] = dates.month
+        df['Day'] = dates.day
+
+    return df
+
+
+def upstream_window(series_id:str, start_date:str=None, end_date:str=None, freq:str=None, **kwargs) -> tuple:
+    """
+    Upstream observation range `fetch` reads for a request: whole periods around the
+    requested dates, shifted back to upstream dates.
+    """
+    spec = SERIES[series_id]
+    freq = normalize_freq(freq) or spec.default_freq or spec.native_freq
+    start, end = window(spec.native_freq, freq, start_date, end_date)
+    shift = pd.Timedelta(days=spec.shift_days)
+    return (start - shift if start is not None else None, end - shift if end is not None else None)
+
+
+# Fetch function declared with `registered` for each series, keyed by series ID
+FETCHERS: dict[str, Callable] = {}
+
+
+def registered(series_id:str):
+    """
+    Declare a fetch function that returns registered series `series_id` via `fetch`, so only
+    the window a request reads is loaded ahead of time. The function backs the series' route
+    in `registry.ROUTES`.
+    """
+    declare = uses_series(series_id, window=functools.partial(upstream_window, series_id))
+
+    def decorator(fn):
+        fn = declare(fn)
+        FETCHERS[series_id] = fn
+        return fn
+    return decorator
+
+
+def fetch(series_id:str, start_date:str=None, end_date:str=None, freq:str=None, agg:str=None,
+          date_parts:bool=None) -> pd.DataFrame:
+    """
+    Load a registered series through the shared cache and normalize it per its spec. Only
+    the observations needed for the requested window are loaded, and the resampled series
+    comes from the rollups precomputed at ingest or is memoized per (series, freq, agg)
+    until the underlying data changes.
+    """
+    spec = SERIES[series_id]
+    freq, agg = resolve(spec, freq, agg)
+    stored = get_stored(spec.fred_id, *upstream_window(series_id, start_date, end_date, freq))
+    return build(spec, rolled_up(spec, stored, freq, agg), start_date, end_date, freq, date_parts)
+
+
+# How a panel aligns series that don't share every date
+JOINS = ('outer', 'inner')
+
+
+def panel_freq(series_ids:tuple, freq:str=None) -> str:
+    """
+    Output frequency of a panel: `freq` if given, else the coarsest default of its series,
+    so every column has a value in each period.
+    """
+    freq = normalize_freq(freq)
+    if freq is not None:
+        return freq
+    defaults = [SERIES[series_id].default_freq or SERIES[series_id].native_freq for series_id in series_ids]
+    return max(defaults, key=lambda f: FREQUENCY_RANKS.get(f, 0))
+
+
+def panel_window(series_ids:tuple, start_date:str=None, end_date:str=None, freq:str=None, **kwargs) -> tuple:
+    """
+    Upstream observation range `panel` reads: the union of every series' `upstream_window`.
+    """
+    freq = panel_freq(series_ids, freq)
+    windows = [upstream_window(series_id, start_date, end_date, freq) for series_id in series_ids]
+    starts = [start for start, _ in windows]
+    ends = [end for _, end in windows]
+    return (None if None in starts else min(starts), None if None in ends else max(ends))
+
+
+def panel(series_ids:tuple, start_date:str=None, end_date:str=None, freq:str=None, agg:str=None,
+          join:str='outer') -> pd.DataFrame:
+    """
+    Registered series aligned on one Date column, one column per series ID. Each series is
+    rolled up and sliced as by `fetch` and labelled by period, then all of them are aligned
+    in a single concat on the index rather than merged one at a time.
+    """
+    if join not in JOINS:
+        raise ValueError(f"Unsupported join '{join}'; expected one of {', '.join(JOINS)}")
+    freq = panel_freq(series_ids, freq)
+    columns = {}
+    for series_id in series_ids:
+        spec = SERIES[series_id]
+        _, series_agg = resolve(spec, freq, agg)
+        stored = get_stored(spec.fred_id, *upstream_window(series_id, start_date, end_date, freq))
+        series = scaled(spec, rolled_up(spec, stored, freq, series_agg), start_date, end_date, freq)
+        columns[series_id] = relabel(series, freq)
+
+    aligned = pd.concat(columns, axis=1, join=join, sort=True)
+    return pd.DataFrame({'Date': aligned.index, **{col: aligned[col].to_numpy() for col in aligned.columns}})
+
+
+# The series a panel reads depend on the request, so `afetch` asks for them per call
+panel.series_ids = lambda series_ids, **kwargs: series_ids
+panel.window = panel_window
+
+
+def frame(series_id:str) -> pd.DataFrame:
+    """
+    Raw observations of a registered series as a Date/value frame named per its spec,
+    for composites that combine series before normalizing.
+    """
+    spec = SERIES[series_id]
+    series = get_series(spec.fred_id)
+    return pd.DataFrame({'Date': series.index, spec.column: series.to_numpy()})
+
+
+def annual(series_id:str, agg:str='mean') -> pd.DataFrame:
+    """
+    Annual rollup of a registered series' full history as a Year/value frame named per its
+    spec, read from the rollups precomputed at ingest.
+    """
+    spec = SERIES[series_id]
+    series = rolled_up(spec, get_stored(spec.fred_id), 'A', agg)
+    return pd.DataFrame({'Year': series.index.year, spec.column: series.to_numpy()})
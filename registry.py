@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SeriesSpec:
+    """
+    Declarative description of a FRED series and how it is normalized for output.
+
+    Any of the resampling frequencies can be requested; `agg` is how observations are
+    combined when going to a coarser frequency, and going finer fills forward.
+    """
+    fred_id: str
+    column: str
+    native_freq: str
+    path: str | None = None
+    default_freq: str | None = None
+    multiplier: float | None = None
+    rounding: int | None = None
+    date_parts: bool = True
+    shift_days: int = 0
+    agg: str = 'mean'
+
+
+SPECS = [
+    # Commodities
+    SeriesSpec('APU0000708111', 'Eggs Per Dozen', 'M', path='/egg-prices', default_freq='M', date_parts=False),
+    SeriesSpec('APU0000709112', 'Milk Per Gallon', 'M', path='/milk-prices', default_freq='M', date_parts=False),
+    SeriesSpec('APU0000703112', 'Ground Beef 1lb', 'M', path='/ground-beef-prices', default_freq='M', date_parts=False),
+    SeriesSpec('APU0000702111', 'Bread 1lb', 'M', path='/bread-prices', default_freq='M', date_parts=False),
+    SeriesSpec('APU0000FF1101', 'Chicken 1lb', 'M', path='/chicken-prices', default_freq='M', date_parts=False),
+    SeriesSpec('APU000074714', 'Gas Per Gallon', 'M', path='/gas-prices', default_freq='M', date_parts=False),
+    SeriesSpec('APU000072610', 'Electric Per kWh', 'M', path='/electric-kwh-prices', default_freq='M', rounding=2, date_parts=False),
+    SeriesSpec('APU0000717311', 'Coffee 1lb', 'M', path='/coffee-prices', default_freq='M', rounding=2, date_parts=False),
+    SeriesSpec('APU0000704111', 'Bacon 1lb', 'M', path='/bacon-prices', default_freq='M', rounding=2, date_parts=False),
+    # Rates
+    SeriesSpec('MORTGAGE30US', '30yr Mortgage Rate', 'W', path='/mortgage-30yr', default_freq='W', rounding=3, date_parts=False),
+    SeriesSpec('MORTGAGE15US', '15yr Mortgage Rate', 'W', path='/mortgage-15yr', default_freq='W', rounding=3, date_parts=False),
+    SeriesSpec('SOFR', 'SOFR', 'D', path='/sofr', default_freq='D', rounding=3),
+    SeriesSpec('FEDFUNDS', 'Fed Funds Rate', 'M', path='/fed-funds', default_freq='M'),
+    # Inflation and Prices
+    SeriesSpec('CPIAUCSL', 'CPI', 'M', path='/cpi', default_freq='M', date_parts=False),
+    SeriesSpec('PCE', 'PCE', 'M', path='/pce', default_freq='M', multiplier=1_000_000_000, date_parts=False),
+    SeriesSpec('CUSR0000SETA02', 'Used Auto CPI', 'M', default_freq='M', date_parts=False),
+    SeriesSpec('CUUR0000SETA01', 'New Auto CPI', 'M', default_freq='M', date_parts=False),
+    SeriesSpec('PCU9241269241262', 'HOI PPI', 'M', default_freq='M', date_parts=False),
+    # Income and Spending
+    SeriesSpec('DSPI', 'RDPI', 'M', path='/rdpi', default_freq='M', multiplier=1_000_000_000),
+    SeriesSpec('CXU500110LB0101M', 'Vehicle Ins Annual', 'A', path='/vehicle-insurance', default_freq='M'),
+    SeriesSpec('DHLCRC1Q027SBEA', 'PCE Healthcare', 'Q', path='/pce-healthcare', default_freq='M', multiplier=1_000_000_000),
+    SeriesSpec('CXUHHOPERLB0101M', 'Household Ops Annual', 'A', path='/hh-ops', default_freq='M'),
+    SeriesSpec('MEFAINUSA646N', 'Median Family Income', 'A', path='/median-family-income', default_freq='M'),
+    # Housing
+    SeriesSpec('MSPUS', 'Median Home Sales Price', 'Q', path='/mspus', default_freq='M'),
+    SeriesSpec('MSPNHSUS', 'Median New Home Price', 'M', path='/mspnus', default_freq='M'),
+    SeriesSpec('CSUSHPINSA', 'CSHI', 'M', path='/cshi', default_freq='M', rounding=2),
+    SeriesSpec('NHFSEPNTS', 'New Homes NS', 'M', path='/new-homes-ns', default_freq='M', multiplier=1000),
+    SeriesSpec('NHFSEPUCS', 'New Homes UC', 'M', path='/new-homes-uc', default_freq='M', multiplier=1000),
+    SeriesSpec('NHFSEPCS', 'New Homes Comp', 'M', path='/new-homes-comp', default_freq='M', multiplier=1000),
+    SeriesSpec('HNFSUSNSA', 'New SF Homes', 'M', path='/new-sf-homes-for-sale', default_freq='M', multiplier=1000),
+    # Demographics
+    SeriesSpec('TTLHH', 'US Households', 'A', path='/households', default_freq='A', multiplier=1000),
+    SeriesSpec('POPTHM', 'US Population', 'M', path='/population', default_freq='M', multiplier=1000),
+    SeriesSpec('SPDYNCBRTINUSA', 'Births Per 1000', 'A', path='/us-birthrate', default_freq='A'),
+    # Delinquencies
+    SeriesSpec('DRCCLACBS', 'DQ Percent', 'Q', path='/dq-credit-cards', default_freq='Q'),
+    SeriesSpec('DRCLACBS', 'DQ Percent', 'Q', path='/dq-consumer-loans', default_freq='Q'),
+    SeriesSpec('DRSFRMACBS', 'DQ Percent', 'Q', path='/dq-sfr-mtg', default_freq='Q'),
+    SeriesSpec('DRALACBS', 'DQ Percent', 'Q', path='/dq-all-loans', default_freq='Q'),
+    # Money Aggregates
+    SeriesSpec('M2SL', 'M2 Supply', 'M', path='/m2-supply', default_freq='M', multiplier=1_000_000_000),
+    SeriesSpec('M2V', 'M2 Velocity', 'Q', path='/m2-velocity', default_freq='Q'),
+    # Output and Growth
+    # GDP observations are dated at the start of the quarter *after* the one they cover
+    SeriesSpec('GDP', 'GDP', 'Q', path='/gdp', default_freq='Q', multiplier=1_000_000_000, shift_days=-1),
+    # Wages and Employment
+    SeriesSpec('UNRATE', 'Unrate', 'M', path='/unrate', default_freq='M', rounding=2),
+    SeriesSpec('UNEMPLOY', 'Unemployed', 'M', path='/unemployed', default_freq='M', multiplier=1000),
+    SeriesSpec('JTSJOL', 'Job Openings', 'M', path='/job-openings', default_freq='M', multiplier=1000),
+]
+
+# Every FRED series the API reads, keyed by series ID
+SERIES: dict[str, SeriesSpec] = {spec.fred_id: spec for spec in SPECS}
+
+# Registered series that back a single-series route, keyed by path
+ROUTES: dict[str, SeriesSpec] = {spec.path: spec for spec in SPECS if spec.path is not None}
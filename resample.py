@@ -0,0 +1,187 @@
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv
+import os
+import pandas as pd
+
+load_dotenv()
+
+# Number of resampled series kept by `rollups`
+ROLLUP_CACHE_SIZE = int(os.getenv("ROLLUP_CACHE_SIZE", "256"))
+
+FREQUENCIES = ('D', 'W', 'M', 'Q', 'A')
+AGGREGATIONS = ('mean', 'last', 'max', 'min', 'sum', 'ffill')
+
+# Output periods are labelled by their first day, except weeks, which end on Sunday
+RULES = {'D': 'D', 'W': 'W-SUN', 'M': 'MS', 'Q': 'QS', 'A': 'YS'}
+PERIODS = {'D': 'D', 'W': 'W-SUN', 'M': 'M', 'Q': 'Q', 'A': 'Y'}
+
+FREQUENCY_RANKS = {'D': 0, 'W': 1, 'BW': 2, 'M': 3, 'Q': 4, 'SA': 5, 'A': 6}
+
+# Rollups precomputed for every full-history series whenever new observations arrive
+PYRAMID_FREQUENCIES = ('M', 'Q', 'A')
+PYRAMID_AGGREGATIONS = ('mean', 'last', 'max', 'min', 'sum')
+
+
+def normalize_freq(freq: str | None) -> str | None:
+    if freq is None:
+        return None
+    freq = freq.strip().upper()
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unsupported frequency '{freq}'; expected one of {', '.join(FREQUENCIES)}")
+    return freq
+
+
+def normalize_agg(agg: str | None) -> str | None:
+    if agg is None:
+        return None
+    agg = agg.strip().lower()
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation '{agg}'; expected one of {', '.join(AGGREGATIONS)}")
+    return agg
+
+
+def is_upsample(native: str, freq: str) -> bool:
+    return FREQUENCY_RANKS.get(freq, 0) < FREQUENCY_RANKS.get(native, 0)
+
+
+def default_agg(native: str, freq: str, agg: str = 'mean') -> str:
+    """
+    Going to a finer frequency repeats the last observation; going coarser uses `agg`.
+    """
+    return 'ffill' if is_upsample(native, freq) else agg
+
+
+def period_label(date, freq: str) -> pd.Timestamp:
+    """
+    Label of the `freq` period containing `date`, as produced by `resample`.
+    """
+    period = pd.Timestamp(date).to_period(PERIODS[freq])
+    return period.end_time.normalize() if freq == 'W' else period.start_time
+
+
+def relabel(series: pd.Series, freq: str) -> pd.Series:
+    """
+    A series indexed by the labels `resample` gives the `freq` periods its dates fall in, so
+    series left at their native frequency line up with resampled ones.
+    """
+    periods = series.index.to_period(PERIODS[freq])
+    labels = periods.end_time.normalize() if freq == 'W' else periods.start_time
+    if labels.equals(series.index):
+        return series
+    return pd.Series(series.to_numpy(), index=labels, name=series.name)
+
+
+def window(native: str, freq: str, start=None, end=None) -> tuple[pd.Timestamp | None, pd.Timestamp | None]:
+    """
+    Observation range needed to build every `freq` period overlapping `start`..`end`: whole
+    periods of the coarser frequency, plus the observations either side to fill forward
+    between when upsampling.
+    """
+    if freq == native:
+        return (pd.Timestamp(start) if start is not None else None, pd.Timestamp(end) if end is not None else None)
+
+    coarse = native if is_upsample(native, freq) else freq
+    period = PERIODS.get(coarse)
+    lo = hi = None
+    if start is not None:
+        lo = pd.Timestamp(start)
+        if period is not None:
+            lo = lo.to_period(period).start_time
+        if is_upsample(native, freq) and native in PERIODS:
+            lo = (lo.to_period(PERIODS[native]) - 1).start_time
+    if end is not None:
+        hi = pd.Timestamp(end)
+        if period is not None:
+            hi = hi.to_period(period).end_time.normalize()
+        if is_upsample(native, freq) and native in PERIODS:
+            hi = (hi.to_period(PERIODS[native]) + 1).end_time.normalize()
+    return lo, hi
+
+
+def resample(series: pd.Series, native: str, freq: str | None, agg: str) -> pd.Series:
+    """
+    Convert a series from its native frequency to `freq` using `agg`. Same-frequency requests
+    are returned untouched.
+    """
+    if freq is None or freq == native:
+        return series
+    return getattr(series.resample(RULES[freq]), agg)()
+
+
+def period_slice(series: pd.Series, freq: str, start=None, end=None) -> pd.Series:
+    """
+    Periods of a resampled series that overlap `start`..`end`, located by binary search.
+    """
+    index = series.index
+    lo = index.searchsorted(period_label(start, freq), side='left') if start is not None else 0
+    hi = index.searchsorted(period_label(end, freq), side='right') if end is not None else len(index)
+    return series.iloc[lo:hi]
+
+
+def pyramid(series: pd.Series, native: str | None, previous: dict | None = None, since=None) -> dict[str, pd.DataFrame]:
+    """
+    Monthly, quarterly and annual rollups of `series` that are coarser than `native`, keyed by
+    frequency with one column per aggregation.
+
+    Given the `previous` pyramid and the date new observations start `since`, periods before
+    the one containing `since` are kept and only the rest are recomputed.
+    """
+    if series.empty:
+        return {}
+
+    levels = {}
+    for freq in PYRAMID_FREQUENCIES:
+        if FREQUENCY_RANKS[freq] <= FREQUENCY_RANKS.get(native, 0):
+            continue
+        part, kept = series, None
+        if previous and freq in previous and since is not None:
+            label = period_label(since, freq)
+            kept = previous[freq].iloc[:previous[freq].index.searchsorted(label)]
+            part = series.iloc[series.index.searchsorted(label):]
+        level = part.resample(RULES[freq]).agg(list(PYRAMID_AGGREGATIONS)) if not part.empty else None
+        if kept is not None and not kept.empty:
+            level = pd.concat([kept, level]) if level is not None else kept
+        if level is not None:
+            levels[freq] = level
+    return levels
+
+
+class Rollups:
+    """
+    LRU of resampled series keyed by (series, freq, agg). Each entry remembers the version of
+    the data it was built from and is rebuilt once that changes, so repeated rollups of
+    unchanged data are free.
+    """
+
+    def __init__(self, maxsize: int = ROLLUP_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, version, build) -> pd.Series:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        series = build()
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = (version, series)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return series
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+rollups = Rollups()
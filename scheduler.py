@@ -0,0 +1,203 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+import os
+import series_cache
+from series_cache import SERIES_FREQUENCIES
+from series_store import store
+
+load_dotenv()
+
+BACKGROUND_REFRESH = os.getenv("BACKGROUND_REFRESH", "false").lower() in ("1", "true", "yes")
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "4"))
+SCHEDULER_TICK_SECONDS = float(os.getenv("SCHEDULER_TICK_SECONDS", "30"))
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# How often a new observation is expected, by native frequency.
+REFRESH_CADENCES = {
+    'D': DAY,
+    'W': 7 * DAY,
+    'BW': 14 * DAY,
+    'M': 30 * DAY,
+    'Q': 91 * DAY,
+    'SA': 182 * DAY,
+    'A': 365 * DAY,
+}
+
+# Once a release is due, how often FRED is polled until it shows up. Polls only hit the
+# series info endpoint unless last_updated has moved.
+POLL_INTERVALS = {
+    'D': HOUR,
+    'W': 6 * HOUR,
+    'BW': 6 * HOUR,
+}
+
+DEFAULT_POLL_INTERVAL = DAY
+
+# Releases land at roughly the same point in each period, so polling for the next one
+# starts this fraction of a cadence after the last update was seen.
+RELEASE_LEAD = 0.8
+
+
+def _isoformat(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass
+class ScheduledSeries:
+    series_id: str
+    frequency: str
+    next_run: float
+    last_run: float | None = None
+    last_status: str | None = None
+    last_error: str | None = None
+    last_duration: float | None = None
+    last_changed: float | None = None
+    running: bool = False
+
+    @property
+    def cadence(self) -> float:
+        return REFRESH_CADENCES.get(self.frequency, REFRESH_CADENCES['M'])
+
+    @property
+    def poll_interval(self) -> float:
+        return POLL_INTERVALS.get(self.frequency, DEFAULT_POLL_INTERVAL)
+
+    def to_dict(self) -> dict:
+        return {
+            "series_id": self.series_id,
+            "frequency": self.frequency,
+            "cadence_hours": round(self.cadence / HOUR, 1),
+            "next_run": _isoformat(self.next_run),
+            "last_run": _isoformat(self.last_run),
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "last_duration": self.last_duration,
+            "last_changed": _isoformat(self.last_changed),
+            "running": self.running,
+        }
+
+
+class RefreshScheduler:
+    """
+    Background refresher that keeps the local series store current so request handlers
+    only ever read local data.
+
+    Each series is refreshed on its own cadence: after an update is seen, the next check
+    is scheduled most of a period later, then FRED is polled at the series' poll interval
+    until the next release appears. Refreshes run on a bounded thread pool.
+    """
+
+    def __init__(self, series: dict[str, str] = SERIES_FREQUENCIES, max_workers: int = SCHEDULER_WORKERS,
+                 tick: float = SCHEDULER_TICK_SECONDS, sync=series_cache.sync, clock=time.time):
+        self.max_workers = max_workers
+        self.tick = tick
+        self._sync = sync
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self.jobs: dict[str, ScheduledSeries] = {}
+        for series_id, frequency in series.items():
+            self.register(series_id, frequency)
+
+    def register(self, series_id: str, frequency: str) -> None:
+        """
+        Add a series to the schedule. Series with a recent local copy wait one poll interval
+        before their first check; everything else is due immediately.
+        """
+        job = ScheduledSeries(series_id=series_id, frequency=frequency, next_run=self._clock())
+        meta = store.metadata(series_id)
+        if meta is not None:
+            job.next_run = max(job.next_run, meta.get("fetched_at", 0.0) + job.poll_interval)
+        with self._lock:
+            self.jobs[series_id] = job
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="series-refresh")
+        self._thread = threading.Thread(target=self._loop, name="series-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_due()
+            self._stop.wait(self.tick)
+
+    def run_due(self) -> list[str]:
+        """
+        Submit every series whose next run has passed and isn't already refreshing.
+        """
+        now = self._clock()
+        with self._lock:
+            due = [job for job in self.jobs.values() if not job.running and job.next_run <= now]
+            for job in due:
+                job.running = True
+
+        for job in due:
+            if self._pool is not None:
+                self._pool.submit(self._refresh, job)
+            else:
+                self._refresh(job)
+
+        return [job.series_id for job in due]
+
+    def _refresh(self, job: ScheduledSeries) -> None:
+        started = self._clock()
+        before = store.metadata(job.series_id)
+        try:
+            stored = self._sync(job.series_id)
+        except Exception as e:
+            status, error, changed = "error", str(e), False
+        else:
+            changed = before is None or stored.last_updated != before.get("last_updated")
+            status, error = ("updated" if changed else "unchanged"), None
+
+        finished = self._clock()
+        with self._lock:
+            job.running = False
+            job.last_run = finished
+            job.last_status = status
+            job.last_error = error
+            job.last_duration = round(finished - started, 3)
+            if changed:
+                job.last_changed = finished
+                job.next_run = finished + job.cadence * RELEASE_LEAD
+            else:
+                job.next_run = finished + job.poll_interval
+
+    def status(self) -> dict:
+        with self._lock:
+            jobs = sorted(self.jobs.values(), key=lambda job: job.next_run)
+            return {
+                "enabled": BACKGROUND_REFRESH,
+                "running": self.running,
+                "workers": self.max_workers,
+                "series": [job.to_dict() for job in jobs],
+            }
+
+
+scheduler = RefreshScheduler()
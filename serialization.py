@@ -0,0 +1,340 @@
+import json
+from typing import Iterator
+from dotenv import load_dotenv
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.responses import Response, StreamingResponse
+from starlette.datastructures import Headers
+import conditional
+from compress import bodies
+from formats import MEDIA_TYPES, negotiate, normalize_format
+
+load_dotenv()
+
+# Rows encoded per chunk by the streamed formats
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "5000"))
+
+# Steps tried, in order, when a compact response describes its dates as start + frequency.
+# Month-end dates step from month end to month end rather than drifting to the 28th.
+STEPS = {
+    'D': (pd.DateOffset(days=1),),
+    'W': (pd.DateOffset(weeks=1),),
+    'M': (pd.DateOffset(months=1), pd.offsets.MonthEnd(1)),
+    'Q': (pd.DateOffset(months=3), pd.offsets.MonthEnd(3)),
+    'A': (pd.DateOffset(years=1), pd.offsets.MonthEnd(12)),
+}
+
+# Text of every calendar day serialized so far, quoted for JSON and bare for CSV, keyed by
+# days since the epoch. Series share the same few thousand dates, so formatting each day
+# once makes dates a lookup.
+_DAY_TEXT: dict[int, str] = {}
+_DAY_CSV: dict[int, str] = {}
+
+
+def _day_text(values: np.ndarray, quoted: bool = True) -> list[str]:
+    cache = _DAY_TEXT if quoted else _DAY_CSV
+    days = values.astype("datetime64[D]")
+    keys = days.view(np.int64).tolist()
+    try:
+        return list(map(cache.__getitem__, keys))
+    except KeyError:
+        unique = np.unique(days)
+        text = unique.astype(str).tolist()
+        cache.update(zip(unique.view(np.int64).tolist(), ('"' + day + '"' for day in text) if quoted else text))
+        return list(map(cache.__getitem__, keys))
+
+
+def _null_where(text: list[str], mask: np.ndarray) -> list[str]:
+    for i in np.flatnonzero(mask).tolist():
+        text[i] = "null"
+    return text
+
+
+def _key(col) -> str:
+    return json.dumps(str(col), ensure_ascii=False)
+
+
+def json_values(col: pd.Series) -> list[str]:
+    """
+    JSON text of every value in a column, converted a whole column at a time: numbers are
+    formatted straight from the numpy array, dates as quoted YYYY-MM-DD, and NaN/NaT/None
+    (and infinities, which JSON can't represent) as null.
+    """
+    dtype = col.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind == "M":
+        values = col.to_numpy()
+        return _null_where(_day_text(values), np.isnat(values))
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        # Timezone-aware dates are formatted in their own timezone
+        text = ('"' + col.dt.strftime("%Y-%m-%d") + '"').tolist()
+        return _null_where(text, col.isna().to_numpy())
+
+    if isinstance(dtype, np.dtype) and dtype.kind == "b":
+        return ["true" if value else "false" for value in col.tolist()]
+
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        return list(map(str, col.to_numpy().tolist()))
+
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        values = col.to_numpy()
+        # float repr is the shortest round-trip form, exactly what the json module writes
+        return _null_where(list(map(float.__repr__, values.tolist())), ~np.isfinite(values))
+
+    # Strings, nullable extension types and mixed objects
+    missing = col.isna().to_numpy()
+    return [
+        "null" if is_missing else json.dumps(value.item() if isinstance(value, np.generic) else value, ensure_ascii=False)
+        for value, is_missing in zip(col.to_numpy(dtype=object), missing)
+    ]
+
+
+def records_json(df: pd.DataFrame) -> bytes:
+    """
+    Encode a DataFrame as a JSON array of records, the same document `to_dict(orient="records")`
+    followed by `json.dumps` would give, without building a dict per row.
+    """
+    if df.empty:
+        return b"[]"
+    keys = [_key(col).replace("%", "%%") for col in df.columns]
+    template = "{" + ",".join(f"{key}:%s" for key in keys) + "}"
+    columns = [json_values(df.iloc[:, i]) for i in range(df.shape[1])]
+    body = ",".join([template % row for row in zip(*columns)])
+    return ("[" + body + "]").encode("utf-8")
+
+
+def _array(col: pd.Series) -> str:
+    return "[" + ",".join(json_values(col)) + "]"
+
+
+def _object(df: pd.DataFrame) -> str:
+    return "{" + ",".join(f"{_key(col)}:{_array(df[col])}" for col in df.columns) + "}"
+
+
+def columns_json(df: pd.DataFrame) -> bytes:
+    """
+    Encode a DataFrame as one array per column: {"Date": [...], "CPI": [...]}.
+    """
+    return _object(df).encode("utf-8")
+
+
+def split_json(df: pd.DataFrame) -> bytes:
+    """
+    Encode a DataFrame as column names plus row arrays: {"columns": [...], "data": [[...], ...]}.
+    """
+    names = "[" + ",".join(_key(col) for col in df.columns) + "]"
+    if df.empty:
+        return ('{"columns":' + names + ',"data":[]}').encode("utf-8")
+    template = "[" + ",".join(["%s"] * df.shape[1]) + "]"
+    columns = [json_values(df.iloc[:, i]) for i in range(df.shape[1])]
+    data = ",".join([template % row for row in zip(*columns)])
+    return ('{"columns":' + names + ',"data":[' + data + "]}").encode("utf-8")
+
+
+def date_step(dates: pd.DatetimeIndex) -> str | None:
+    """
+    The frequency code whose steps from the first date reproduce `dates` exactly, or None if
+    the dates aren't evenly spaced.
+    """
+    if len(dates) < 2 or dates.hasnans:
+        return None
+    for freq, steps in STEPS.items():
+        for step in steps:
+            # Past the 28th, stepping a month at a time drifts away from adding months to the start
+            if freq in ('M', 'Q', 'A') and dates[0].day > 28 and not isinstance(step, pd.offsets.MonthEnd):
+                continue
+            # A step can only fit if it matches the gap between the first two dates
+            if dates[0] + step == dates[1] and dates.equals(pd.date_range(dates[0], periods=len(dates), freq=step)):
+                return freq
+    return None
+
+
+def compact_json(df: pd.DataFrame) -> bytes:
+    """
+    Encode a time series with its dates implied: {"start": "2020-01-01", "freq": "M",
+    "values": {"CPI": [...]}}. Year/Month/Day are dropped as they follow from the dates.
+    Frames keyed by Year give the first year as `start`. Dates that aren't evenly spaced
+    are sent as a "dates" array instead of start and freq.
+    """
+    if 'Date' in df.columns:
+        dates = pd.DatetimeIndex(df['Date'])
+        values = df.drop(columns=[c for c in ('Date', 'Year', 'Month', 'Day') if c in df.columns])
+        freq = date_step(dates)
+        start = json_values(df['Date'].iloc[:1])[0] if len(df) else "null"
+    elif 'Year' in df.columns:
+        years = df['Year'].to_numpy()
+        values = df.drop(columns='Year')
+        regular = len(years) > 1 and bool((np.diff(years) == 1).all())
+        freq = 'A' if regular else None
+        start = str(int(years[0])) if regular else "null"
+    else:
+        return columns_json(df)
+
+    if freq is not None:
+        head = f'"start":{start},"freq":"{freq}"'
+    else:
+        head = '"dates":' + _array(df['Date'] if 'Date' in df.columns else df['Year'])
+    return ("{" + head + ',"values":' + _object(values) + "}").encode("utf-8")
+
+
+def arrow_ipc(df: pd.DataFrame) -> bytes:
+    """
+    Encode a DataFrame as an Arrow IPC stream, straight from its column arrays.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def parquet_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Encode a DataFrame as a Parquet file.
+    """
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), sink)
+    return sink.getvalue().to_pybytes()
+
+
+def _csv_field(value) -> str:
+    text = str(value)
+    if any(c in text for c in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def csv_values(col: pd.Series) -> list[str]:
+    """
+    CSV fields of every value in a column: numbers as in JSON, dates as bare YYYY-MM-DD,
+    missing values as empty fields and text quoted only where needed.
+    """
+    dtype = col.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind == "M":
+        values = col.to_numpy()
+        text = _day_text(values, quoted=False)
+        missing = np.isnat(values)
+    elif isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        text = json_values(col)
+        missing = col.isna().to_numpy() if dtype.kind == "f" else None
+        if dtype.kind == "f":
+            missing |= ~np.isfinite(col.to_numpy())
+    else:
+        missing = col.isna().to_numpy()
+        text = [_csv_field(value.strftime("%Y-%m-%d") if isinstance(value, pd.Timestamp) else value)
+                for value in col.to_numpy(dtype=object)]
+    if missing is not None:
+        for i in np.flatnonzero(missing).tolist():
+            text[i] = ""
+    return text
+
+
+def csv_chunks(df: pd.DataFrame, rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    CSV with a header row, encoded `rows` rows at a time. Dates are written as YYYY-MM-DD and
+    missing values as empty fields.
+    """
+    header = ",".join(_csv_field(col) for col in df.columns) + "\n"
+    if df.empty:
+        yield header.encode("utf-8")
+        return
+    template = ",".join(["%s"] * df.shape[1]) + "\n"
+    for start in range(0, len(df), rows):
+        chunk = df.iloc[start:start + rows]
+        columns = [csv_values(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+        body = "".join([template % row for row in zip(*columns)])
+        yield ((header if start == 0 else "") + body).encode("utf-8")
+
+
+def ndjson_chunks(df: pd.DataFrame, rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    One JSON object per line, the same objects as the records format, encoded `rows` rows at
+    a time.
+    """
+    keys = [_key(col).replace("%", "%%") for col in df.columns]
+    template = "{" + ",".join(f"{key}:%s" for key in keys) + "}\n"
+    for start in range(0, len(df), rows):
+        chunk = df.iloc[start:start + rows]
+        columns = [json_values(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+        yield "".join([template % row for row in zip(*columns)]).encode("utf-8")
+
+
+# Formats sent chunk by chunk as they're encoded instead of as one body
+STREAMERS = {
+    'csv': csv_chunks,
+    'ndjson': ndjson_chunks,
+}
+
+
+ENCODERS = {
+    'records': records_json,
+    'columns': columns_json,
+    'split': split_json,
+    'compact': compact_json,
+    'arrow': arrow_ipc,
+    'parquet': parquet_bytes,
+    'csv': lambda df: b"".join(csv_chunks(df)),
+    'ndjson': lambda df: b"".join(ndjson_chunks(df)),
+}
+
+
+class DataFrameResponse(Response):
+    """
+    Response rendered from a DataFrame. The body is only encoded when the response is sent,
+    so the format can follow the request's Accept header: an Arrow IPC stream, Parquet, CSV
+    or NDJSON for clients that ask for one, otherwise JSON. An explicit `format` takes
+    precedence, and JSON uses the records layout unless `format` names another.
+
+    CSV and NDJSON are streamed in chunks of STREAM_CHUNK_ROWS rows, encoded in the
+    threadpool, so the full body is never held in memory. Other bodies are kept in `bodies`
+    under the request's ETag, so repeat requests for the same data skip encoding.
+    """
+    media_type = "application/json"
+
+    def __init__(self, content: pd.DataFrame, format: str | None = None, status_code: int = 200,
+                 headers: dict | None = None, background=None):
+        self.frame = content
+        self.format = normalize_format(format)
+        self.extra_headers = {**(headers or {}), "vary": "Accept"}
+        super().__init__(None, status_code=status_code, headers=self.extra_headers, background=background)
+
+    def render(self, content) -> bytes:
+        # Placeholder until `encode` knows the request's Accept header
+        return b""
+
+    def negotiated(self, accept: str | None = None) -> str:
+        return self.format or negotiate(accept) or 'records'
+
+    def encode(self, accept: str | None = None) -> bytes:
+        format = self.negotiated(accept)
+        self.media_type = MEDIA_TYPES.get(format, "application/json")
+        # A body built for the same ETag is byte-for-byte this one
+        request = conditional.current()
+        etag = request.etag if request is not None else None
+        body = bodies.get(etag) if etag is not None else None
+        if body is None:
+            body = ENCODERS[format](self.frame)
+            if etag is not None:
+                bodies.put(etag, "identity", body)
+        self.body = body
+        self.init_headers(self.extra_headers)
+        return self.body
+
+    async def __call__(self, scope, receive, send) -> None:
+        # No frame: the client's copy is current and the 304 carries no body
+        if self.frame is None:
+            await super().__call__(scope, receive, send)
+            return
+        accept = Headers(scope=scope).get("accept")
+        format = self.negotiated(accept)
+        if format in STREAMERS:
+            stream = StreamingResponse(STREAMERS[format](self.frame), status_code=self.status_code,
+                                       headers=self.extra_headers, media_type=MEDIA_TYPES[format],
+                                       background=self.background)
+            await stream(scope, receive, send)
+            return
+        self.encode(accept)
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,657 @@
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+import pandas as pd
+from dotenv import load_dotenv
+import os
+from clients import AsyncFredClient, FredClient
+import conditional
+from registry import SERIES
+from resample import pyramid
+from series_store import StoredSeries, format_date, sorted_series, store
+
+load_dotenv()
+
+# Upper bound on series loaded concurrently when a composite dataset fans out
+FANOUT_WORKERS = int(os.getenv("FANOUT_WORKERS", "8"))
+
+# Number of fetch results memoized by `afetch`
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+
+# Token required by POST /cache/invalidate; the route is disabled (404) while this is unset
+CACHE_ADMIN_TOKEN = os.getenv("CACHE_ADMIN_TOKEN") or None
+
+# Shared upstream clients; every series fetch goes through their pooled keep-alive sessions
+fred = FredClient()
+afred = AsyncFredClient()
+
+
+# Native frequency of every FRED series used by the category modules.
+SERIES_FREQUENCIES = {series_id: spec.native_freq for series_id, spec in SERIES.items()}
+
+# Seconds a cached series stays fresh, by native frequency. Release days are not
+# known up front, so the TTL is a fraction of the period rather than the full period.
+FREQUENCY_TTLS = {
+    'D': 60 * 60,
+    'W': 6 * 60 * 60,
+    'BW': 6 * 60 * 60,
+    'M': 12 * 60 * 60,
+    'Q': 24 * 60 * 60,
+    'SA': 24 * 60 * 60,
+    'A': 24 * 60 * 60,
+}
+
+DEFAULT_TTL = FREQUENCY_TTLS['M']
+
+# How long a stale local copy is served before upstream is retried after a failed refresh.
+STALE_RETRY_SECONDS = 60
+
+# How far before the last stored observation a delta refresh starts, so that recent
+# revisions are picked up along with the new observations.
+REVISION_WINDOWS = {
+    'D': pd.DateOffset(days=30),
+    'W': pd.DateOffset(weeks=8),
+    'BW': pd.DateOffset(weeks=8),
+    'M': pd.DateOffset(months=6),
+    'Q': pd.DateOffset(months=12),
+    'SA': pd.DateOffset(years=2),
+    'A': pd.DateOffset(years=2),
+}
+
+DEFAULT_REVISION_WINDOW = REVISION_WINDOWS['M']
+
+# Revisions can reach further back than the window (e.g. annual seasonal factor updates),
+# so the full history is still re-pulled periodically.
+FULL_REFRESH_SECONDS = 30 * 24 * 60 * 60
+
+
+def normalize_series_id(series_id: str) -> str:
+    """FRED series IDs are case-insensitive; key everything on the upper-case form."""
+    return series_id.strip().upper()
+
+
+def frequency_for(series_id: str, frequency: str | None = None) -> str | None:
+    """
+    Native frequency of a series, falling back to the frequency reported by FRED for
+    series that aren't listed in SERIES_FREQUENCIES.
+    """
+    return SERIES_FREQUENCIES.get(normalize_series_id(series_id), frequency)
+
+
+def ttl_for(series_id: str, frequency: str | None = None) -> float:
+    """
+    TTL in seconds for a series, based on its native frequency.
+    """
+    return FREQUENCY_TTLS.get(frequency_for(series_id, frequency), DEFAULT_TTL)
+
+
+class SeriesLoader:
+    """
+    Loads series from the local store, going upstream only when the stored copy is
+    missing or older than its TTL. A stale copy is still served if FRED is unreachable.
+
+    Refreshes are incremental: the series info is checked first and nothing is downloaded
+    if FRED's last_updated hasn't moved; otherwise only observations from the last stored
+    date (minus a revision window) onward are requested and spliced onto the stored history.
+
+    Loads can ask for a date range. The range is pushed down to FRED's observation_start/
+    observation_end, so a narrow window never costs a full-history download. A stored copy
+    that doesn't cover a requested range is re-pulled over the union of both ranges.
+
+    Whenever new observations arrive for a full-history copy, its monthly, quarterly and
+    annual rollups are recomputed (from the refresh window onward on a delta) and stored
+    with it.
+    """
+
+    def __init__(self, store=store, client=fred, aclient=afred):
+        self.store = store
+        self.client = client
+        self.aclient = aclient
+        self.store_loads = 0
+        self.upstream_fetches = 0
+        self.delta_fetches = 0
+        self.unchanged_checks = 0
+        self._expired_at: dict[str, float] = {}
+        self._all_expired_at = 0.0
+
+    def expire(self, series_id: str | None = None) -> None:
+        """
+        Treat stored copies synced before now as stale, forcing the next load to re-pull
+        the full history.
+        """
+        if series_id is None:
+            self._all_expired_at = time.time()
+        else:
+            self._expired_at[series_id] = time.time()
+
+    def _expired(self, stored: StoredSeries) -> bool:
+        return stored.fetched_at <= max(self._all_expired_at, self._expired_at.get(stored.series_id, 0.0))
+
+    def is_fresh(self, stored: StoredSeries) -> bool:
+        if self._expired(stored):
+            return False
+        return stored.fetched_at + ttl_for(stored.series_id, stored.frequency) > time.time()
+
+    def needs_full_refresh(self, stored: StoredSeries | None) -> bool:
+        if stored is None or stored.series.empty or self._expired(stored):
+            return True
+        return stored.full_synced_at + FULL_REFRESH_SECONDS <= time.time()
+
+    def _downloaded(self, series_id: str, info, series: pd.Series, start=None, end=None) -> StoredSeries:
+        self.upstream_fetches += 1
+        now = time.time()
+        series = sorted_series(series)
+        full = start is None and end is None
+        return StoredSeries(
+            series_id=series_id,
+            series=series,
+            last_updated=info.get('last_updated'),
+            frequency=info.get('frequency_short'),
+            units=info.get('units'),
+            fetched_at=now,
+            full_synced_at=now,
+            coverage_start=format_date(start),
+            coverage_end=format_date(end),
+            rollups=pyramid(series, frequency_for(series_id, info.get('frequency_short'))) if full else {},
+        )
+
+    @staticmethod
+    def _range(stored: StoredSeries | None, start=None, end=None) -> tuple[str | None, str | None]:
+        if stored is None:
+            return format_date(start), format_date(end)
+        return stored.coverage_with(start, end)
+
+    def _unchanged(self, stored: StoredSeries, info) -> StoredSeries | None:
+        last_updated = info.get('last_updated')
+        if last_updated is not None and last_updated == stored.last_updated:
+            self.unchanged_checks += 1
+            return replace(stored, fetched_at=time.time())
+        return None
+
+    def _window_start(self, stored: StoredSeries, info) -> pd.Timestamp:
+        freq = frequency_for(stored.series_id, info.get('frequency_short'))
+        window_start = stored.series.index[-1] - REVISION_WINDOWS.get(freq, DEFAULT_REVISION_WINDOW)
+        if stored.coverage_start is not None:
+            window_start = max(window_start, pd.Timestamp(stored.coverage_start))
+        return window_start
+
+    def _spliced(self, stored: StoredSeries, info, window_start: pd.Timestamp, delta: pd.Series) -> StoredSeries:
+        self.delta_fetches += 1
+        kept = stored.series.iloc[:stored.series.index.searchsorted(window_start)]
+        series = sorted_series(pd.concat([kept, delta]))
+        native = frequency_for(stored.series_id, info.get('frequency_short'))
+        return replace(
+            stored,
+            series=series,
+            rollups=pyramid(series, native, stored.rollups, window_start) if stored.covers() else {},
+            last_updated=info.get('last_updated'),
+            frequency=info.get('frequency_short', stored.frequency),
+            units=info.get('units', stored.units),
+            fetched_at=time.time(),
+        )
+
+    def _usable(self, stored: StoredSeries | None, allow_stale: bool) -> bool:
+        if stored is None:
+            return False
+        return (allow_stale and not self._expired(stored)) or self.is_fresh(stored)
+
+    def download(self, series_id: str, start=None, end=None) -> StoredSeries:
+        """
+        Pull a series' metadata and its observations between `start` and `end` (full history by default) from FRED.
+        """
+        info = self.client.get_series_info(series_id)
+        series = self.client.get_series(series_id, observation_start=start, observation_end=end)
+        return self._downloaded(series_id, info, series, start, end)
+
+    def refresh(self, stored: StoredSeries) -> StoredSeries:
+        """
+        Bring a stored series up to date, downloading only what changed since it was synced.
+        """
+        info = self.client.get_series_info(stored.series_id)
+        unchanged = self._unchanged(stored, info)
+        if unchanged is not None:
+            return unchanged
+
+        window_start = self._window_start(stored, info)
+        delta = self.client.get_series(stored.series_id, observation_start=window_start, observation_end=stored.coverage_end)
+        return self._spliced(stored, info, window_start, delta)
+
+    def sync(self, series_id: str) -> StoredSeries:
+        """
+        Refresh a series from FRED regardless of its TTL and persist the result. A copy that
+        only covers part of the history is replaced with the full history.
+        """
+        stored = self.store.load(series_id)
+        if self.needs_full_refresh(stored) or not stored.covers():
+            fresh = self.download(series_id)
+        else:
+            fresh = self.refresh(stored)
+        self.store.save(fresh)
+        return fresh
+
+    def __call__(self, series_id: str, allow_stale: bool = False, start=None, end=None) -> StoredSeries:
+        stored = self.store.load(series_id)
+        covered = stored is not None and stored.covers(start, end)
+        if covered and self._usable(stored, allow_stale):
+            self.store_loads += 1
+            return stored
+
+        try:
+            if not covered or self.needs_full_refresh(stored):
+                fresh = self.download(series_id, *self._range(stored, start, end))
+            else:
+                fresh = self.refresh(stored)
+        except Exception:
+            if stored is None:
+                raise
+            self.store_loads += 1
+            return stored
+
+        self.store.save(fresh)
+        return fresh
+
+    async def adownload(self, series_id: str, start=None, end=None) -> StoredSeries:
+        """
+        Async counterpart of `download`, using the asyncio FRED client.
+        """
+        info, series = await asyncio.gather(
+            self.aclient.get_series_info(series_id),
+            self.aclient.get_series(series_id, observation_start=start, observation_end=end),
+        )
+        return self._downloaded(series_id, info, series, start, end)
+
+    async def arefresh(self, stored: StoredSeries) -> StoredSeries:
+        """
+        Async counterpart of `refresh`.
+        """
+        info = await self.aclient.get_series_info(stored.series_id)
+        unchanged = self._unchanged(stored, info)
+        if unchanged is not None:
+            return unchanged
+
+        window_start = self._window_start(stored, info)
+        delta = await self.aclient.get_series(stored.series_id, observation_start=window_start,
+                                              observation_end=stored.coverage_end)
+        return self._spliced(stored, info, window_start, delta)
+
+    async def aload(self, series_id: str, allow_stale: bool = False, start=None, end=None) -> StoredSeries:
+        """
+        Async counterpart of calling the loader. Store reads/writes run in a worker thread.
+        """
+        stored = await asyncio.to_thread(self.store.load, series_id)
+        covered = stored is not None and stored.covers(start, end)
+        if covered and self._usable(stored, allow_stale):
+            self.store_loads += 1
+            return stored
+
+        try:
+            if not covered or self.needs_full_refresh(stored):
+                fresh = await self.adownload(series_id, *self._range(stored, start, end))
+            else:
+                fresh = await self.arefresh(stored)
+        except Exception:
+            if stored is None:
+                raise
+            self.store_loads += 1
+            return stored
+
+        await asyncio.to_thread(self.store.save, fresh)
+        return fresh
+
+
+class SeriesCache:
+    """
+    Process-wide in-memory cache of FRED series keyed by series ID.
+
+    Entries expire a TTL after they were last synced with FRED, based on the series'
+    native frequency. Concurrent misses for the same series are coalesced into a single
+    load. Cached series are shared between callers and must be treated as read-only.
+
+    Reads may ask for a date range; an entry only counts as a hit if it covers that range,
+    otherwise the loader widens it.
+
+    With `read_through` off (when the background scheduler owns refreshes) reads never
+    trigger an upstream refresh: expired entries and stale stored copies are served as-is,
+    and FRED is only hit for series that have no local copy at all.
+    """
+
+    def __init__(self, loader, ttl=ttl_for, clock=time.time):
+        self._loader = loader
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: dict[str, tuple[StoredSeries, float]] = {}
+        self._inflight: dict[str, Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.read_through = True
+
+    def _expires_at(self, key: str, stored: StoredSeries) -> float:
+        now = self._clock()
+        expires_at = stored.fetched_at + self._ttl(key, stored.frequency)
+        if expires_at <= now:
+            expires_at = now + STALE_RETRY_SECONDS
+        return expires_at
+
+    def _hit(self, entry, now: float, start, end) -> bool:
+        return entry is not None and (entry[1] > now or not self.read_through) and entry[0].covers(start, end)
+
+    def _begin(self, key: str, start=None, end=None) -> tuple[StoredSeries | None, Future | None, bool]:
+        """
+        Returns the cached entry on a hit; otherwise the in-flight load to wait on and
+        whether this caller is the one that has to perform it.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if self._hit(entry, now, start, end):
+                self.hits += 1
+                return entry[0], None, False
+            self.misses += 1
+
+            # Single-flight: concurrent misses for the same series share the first caller's load
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+            return None, flight, leader
+
+    def _complete(self, key: str, flight: Future, stored: StoredSeries) -> None:
+        expires_at = self._expires_at(key, stored)
+        with self._lock:
+            self._entries[key] = (stored, expires_at)
+            del self._inflight[key]
+        flight.set_result(stored)
+
+    def _fail(self, key: str, flight: Future, error: BaseException) -> None:
+        with self._lock:
+            del self._inflight[key]
+        flight.set_exception(error)
+
+    def get_stored(self, series_id: str, start=None, end=None) -> StoredSeries:
+        key = normalize_series_id(series_id)
+        while True:
+            stored, flight, leader = self._begin(key, start, end)
+            if stored is not None:
+                return stored
+            if not leader:
+                stored = flight.result()
+                # A shared load for a narrower range doesn't help; go round again
+                if stored.covers(start, end):
+                    return stored
+                continue
+
+            try:
+                stored = self._loader(key, allow_stale=not self.read_through, start=start, end=end)
+            except BaseException as e:
+                self._fail(key, flight, e)
+                raise
+
+            self._complete(key, flight, stored)
+            return stored
+
+    async def _aload(self, key: str, flight: Future, start=None, end=None) -> None:
+        try:
+            stored = await self._loader.aload(key, allow_stale=not self.read_through, start=start, end=end)
+        except BaseException as e:
+            self._fail(key, flight, e)
+        else:
+            self._complete(key, flight, stored)
+
+    async def aget_stored(self, series_id: str, start=None, end=None) -> StoredSeries:
+        """
+        Async counterpart of `get_stored`. Shares in-flight loads with threaded callers.
+        """
+        key = normalize_series_id(series_id)
+        while True:
+            stored, flight, leader = self._begin(key, start, end)
+            if stored is not None:
+                return stored
+            if leader:
+                # The load runs as its own task so one disconnecting client can't cancel it for everyone
+                task = asyncio.create_task(self._aload(key, flight, start, end))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            stored = await asyncio.shield(asyncio.wrap_future(flight))
+            if leader or stored.covers(start, end):
+                return stored
+
+    def get(self, series_id: str, start=None, end=None) -> pd.Series:
+        return self.get_stored(series_id, start, end).series
+
+    def peek(self, series_id: str, start=None, end=None) -> pd.Series | None:
+        """
+        Return a series only if it can be served from memory right now, without loading it.
+        """
+        key = normalize_series_id(series_id)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if self._hit(entry, now, start, end):
+                self.hits += 1
+                return entry[0].series
+        return None
+
+    async def aget(self, series_id: str, start=None, end=None) -> pd.Series:
+        return (await self.aget_stored(series_id, start, end)).series
+
+    def put(self, stored: StoredSeries) -> None:
+        """
+        Replace the cached copy of a series, e.g. after a background refresh.
+        """
+        key = normalize_series_id(stored.series_id)
+        expires_at = self._expires_at(key, stored)
+        with self._lock:
+            self._entries[key] = (stored, expires_at)
+
+    def invalidate(self, series_id: str | None = None) -> int:
+        """
+        Drop one series (or every series when `series_id` is None). Returns the number of entries removed.
+        """
+        with self._lock:
+            if series_id is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            return 1 if self._entries.pop(normalize_series_id(series_id), None) is not None else 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = self._clock()
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": round(self.hits / requests, 4) if requests else None,
+                "entries": len(self._entries),
+                "in_flight": sorted(self._inflight),
+                "series": {
+                    key: {
+                        "expires_in": round(expires_at - now, 1),
+                        "last_updated": stored.last_updated,
+                        "frequency": stored.frequency,
+                        "coverage": [stored.coverage_start, stored.coverage_end],
+                    }
+                    for key, (stored, expires_at) in sorted(self._entries.items())
+                },
+            }
+
+
+loader = SeriesLoader()
+
+cache = SeriesCache(loader)
+
+
+def get_stored(series_id: str, start=None, end=None) -> StoredSeries:
+    """
+    Read a FRED series and its metadata through the shared cache.
+    """
+    return cache.get_stored(series_id, start, end)
+
+
+def get_series(series_id: str, start=None, end=None) -> pd.Series:
+    """
+    Read a FRED series through the shared cache. With `start`/`end`, only that range is
+    guaranteed to be present and the result may hold more; callers slice it themselves.
+    """
+    return cache.get(series_id, start, end)
+
+
+async def aget_series(series_id: str, start=None, end=None) -> pd.Series:
+    """
+    Async read of a FRED series through the shared cache.
+    """
+    return await cache.aget(series_id, start, end)
+
+
+_fanout_pool = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="series-fanout")
+
+
+def get_many(*series_ids: str) -> dict[str, pd.Series]:
+    """
+    Read several series through the cache at once. Duplicate IDs are loaded once, cache hits
+    are served inline and misses are loaded concurrently on a bounded pool.
+    """
+    keys = list(dict.fromkeys(normalize_series_id(s) for s in series_ids))
+    results = {key: cache.peek(key) for key in keys}
+    misses = {key: _fanout_pool.submit(cache.get, key) for key, series in results.items() if series is None}
+    for key, future in misses.items():
+        results[key] = future.result()
+    return results
+
+
+async def prefetch(*series_ids: str, start=None, end=None, return_exceptions: bool = False) -> list[StoredSeries]:
+    """
+    Load several series concurrently through the cache, awaiting upstream I/O instead of
+    blocking. Duplicate IDs are loaded once and at most FANOUT_WORKERS loads run at a time.
+    `start`/`end` limit the load to a date range. With `return_exceptions`, a failed load
+    is returned in place instead of raised.
+    """
+    keys = list(dict.fromkeys(normalize_series_id(s) for s in series_ids))
+    semaphore = asyncio.Semaphore(FANOUT_WORKERS)
+
+    async def load(key):
+        async with semaphore:
+            return await cache.aget_stored(key, start, end)
+
+    return await asyncio.gather(*(load(key) for key in keys), return_exceptions=return_exceptions)
+
+
+def uses_series(*series_ids: str, fan_out: bool = False, window=None):
+    """
+    Declare the FRED series a fetch function reads, so callers can load them ahead of time.
+
+    With `fan_out`, calling the function first loads all of its series concurrently via
+    `get_many`, so a composite dataset costs about one upstream round-trip instead of one per input.
+
+    `window` declares that the function only reads part of its series' history: called with
+    the function's keyword arguments, it returns the (start, end) observation range read, and
+    only that range is loaded ahead of time.
+    """
+    def decorator(fn):
+        ids = tuple(dict.fromkeys(normalize_series_id(s) for s in series_ids))
+        if fan_out:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                get_many(*ids)
+                return fn(*args, **kwargs)
+            wrapper.series_ids = ids
+            wrapper.window = window
+            return wrapper
+        fn.series_ids = ids
+        fn.window = window
+        return fn
+    return decorator
+
+
+# Results of recent fetch calls, keyed by function and arguments, least recently used first
+_results: OrderedDict = OrderedDict()
+
+
+def _result_key(fn, kwargs: dict):
+    try:
+        key = (fn.__module__, fn.__qualname__, frozenset(kwargs.items()))
+        hash(key)
+    except TypeError:
+        # Unhashable arguments (e.g. batch payloads) aren't memoized
+        return None
+    return key
+
+
+async def afetch(fn, **kwargs):
+    """
+    Async version of any fetch function: awaits every series it declares via `uses_series`,
+    then runs it in a worker thread, where its reads are cache hits. A function whose series
+    depend on its arguments can set `series_ids` to a callable taking the same keywords.
+
+    Results are memoized per arguments for as long as none of the declared series has a new
+    `last_updated`, so repeat requests skip the transform entirely. Callers share the returned
+    object and must not modify it.
+
+    During a conditional GET the response validators are set from the same versions, and
+    None is returned without running anything if the client's copy is still current.
+    """
+    series_ids = getattr(fn, "series_ids", ())
+    if callable(series_ids):
+        series_ids = series_ids(**kwargs)
+    if getattr(fn, "window", None) is not None:
+        start, end = fn.window(**kwargs)
+        stored = await prefetch(*series_ids, start=start, end=end)
+    else:
+        stored = await prefetch(*series_ids)
+    version = tuple((s.series_id, s.last_updated, len(s.series)) for s in stored)
+    request = conditional.current()
+    if request is not None and stored and request.validate(fn, kwargs, version, [s.last_updated for s in stored]):
+        return None
+    key = _result_key(fn, kwargs)
+
+    entry = _results.get(key) if key is not None else None
+    if entry is not None and entry[0] == version:
+        _results.move_to_end(key)
+        return entry[1]
+
+    result = await asyncio.to_thread(fn, **kwargs)
+    if key is not None and RESULT_CACHE_SIZE > 0:
+        _results[key] = (version, result)
+        _results.move_to_end(key)
+        while len(_results) > RESULT_CACHE_SIZE:
+            _results.popitem(last=False)
+    return result
+
+
+def sync(series_id: str) -> StoredSeries:
+    """
+    Refresh a series from FRED now, regardless of its TTL, and publish it to the cache.
+    """
+    stored = loader.sync(normalize_series_id(series_id))
+    cache.put(stored)
+    return stored
+
+
+def invalidate(series_id: str | None = None) -> int:
+    """
+    Invalidate one cached series, or the whole cache when no ID is given. The local
+    store copy is marked stale too, so the next read resyncs with FRED.
+    """
+    loader.expire(normalize_series_id(series_id) if series_id is not None else None)
+    return cache.invalidate(series_id)
+
+
+def cache_stats() -> dict:
+    stats = cache.stats()
+    stats["store_loads"] = loader.store_loads
+    stats["upstream_fetches"] = loader.upstream_fetches
+    stats["delta_fetches"] = loader.delta_fetches
+    stats["unchanged_checks"] = loader.unchanged_checks
+    stats["memoized_results"] = len(_results)
+    return stats
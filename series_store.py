@@ -0,0 +1,216 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SERIES_STORE_DIR = os.getenv("SERIES_STORE_DIR", ".series_store")
+
+METADATA_KEY = b"govdata"
+
+
+def _day(date) -> pd.Timestamp:
+    return pd.Timestamp(date).normalize()
+
+
+def format_date(date) -> str | None:
+    return _day(date).strftime("%Y-%m-%d") if date is not None else None
+
+
+def sorted_series(series: pd.Series) -> pd.Series:
+    """
+    Sort a series by date and drop duplicate dates (keeping the latest value) so it can be
+    sliced by binary search.
+    """
+    if not series.index.is_unique:
+        series = series[~series.index.duplicated(keep="last")]
+    if not series.index.is_monotonic_increasing:
+        series = series.sort_index()
+    return series
+
+
+@dataclass
+class StoredSeries:
+    """
+    A FRED series' observations plus the metadata needed to decide when to refresh it.
+
+    `coverage_start`/`coverage_end` bound the date range that was requested upstream; None
+    means unbounded on that side, so a full-history copy has both set to None. Observations
+    are kept on a sorted, de-duplicated DatetimeIndex.
+
+    `rollups` holds the precomputed coarser frequencies of a full-history copy, keyed by
+    frequency with one column per aggregation.
+    """
+    series_id: str
+    series: pd.Series
+    last_updated: str | None = None
+    frequency: str | None = None
+    units: str | None = None
+    fetched_at: float = field(default_factory=time.time)
+    full_synced_at: float = 0.0
+    coverage_start: str | None = None
+    coverage_end: str | None = None
+    rollups: dict[str, pd.DataFrame] = field(default_factory=dict, repr=False)
+
+    def rollup(self, freq: str, agg: str) -> pd.Series | None:
+        """
+        The precomputed `freq` rollup aggregated with `agg`, or None if it wasn't precomputed.
+        """
+        level = self.rollups.get(freq)
+        if level is None or agg not in level.columns:
+            return None
+        return level[agg]
+
+    def covers(self, start=None, end=None) -> bool:
+        """
+        Whether every observation between `start` and `end` (None = unbounded) is held locally.
+        """
+        if self.coverage_start is not None and (start is None or _day(start) < _day(self.coverage_start)):
+            return False
+        if self.coverage_end is not None and (end is None or _day(end) > _day(self.coverage_end)):
+            return False
+        return True
+
+    def coverage_with(self, start=None, end=None) -> tuple[str | None, str | None]:
+        """
+        The smallest range covering both what's held and `start`..`end`.
+        """
+        if self.coverage_start is None or start is None:
+            start = None
+        else:
+            start = min(_day(start), _day(self.coverage_start))
+        if self.coverage_end is None or end is None:
+            end = None
+        else:
+            end = max(_day(end), _day(self.coverage_end))
+        return format_date(start), format_date(end)
+
+    def metadata(self) -> dict:
+        return {
+            "series_id": self.series_id,
+            "last_updated": self.last_updated,
+            "frequency": self.frequency,
+            "units": self.units,
+            "fetched_at": self.fetched_at,
+            "full_synced_at": self.full_synced_at,
+            "coverage_start": self.coverage_start,
+            "coverage_end": self.coverage_end,
+            "observations": int(len(self.series)),
+            "observation_start": self.series.index[0].strftime("%Y-%m-%d") if len(self.series) else None,
+            "observation_end": self.series.index[-1].strftime("%Y-%m-%d") if len(self.series) else None,
+            "rollups": list(self.rollups),
+        }
+
+
+class SeriesStore:
+    """
+    On-disk columnar store holding one Parquet file per FRED series.
+
+    Observations are written as a single `value` column on a date index, with the series
+    metadata embedded in the Parquet schema so a file is always self-describing. Precomputed
+    rollups go to a second file under `rollups/`, tagged with the `fetched_at` of the
+    observations they were built from so a mismatched pair is never read back.
+    """
+
+    def __init__(self, root: str | Path = SERIES_STORE_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path_for(self, series_id: str) -> Path:
+        return self.root / f"{series_id}.parquet"
+
+    def rollups_path_for(self, series_id: str) -> Path:
+        return self.root / "rollups" / f"{series_id}.parquet"
+
+    @staticmethod
+    def _write(table: pa.Table, path: Path, meta: dict) -> None:
+        schema_meta = dict(table.schema.metadata or {})
+        schema_meta[METADATA_KEY] = json.dumps(meta).encode()
+        table = table.replace_schema_metadata(schema_meta)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        # Write then rename so readers in other workers never see a partial file
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _load_rollups(self, series_id: str, fetched_at: float) -> dict[str, pd.DataFrame]:
+        path = self.rollups_path_for(series_id)
+        if not path.exists():
+            return {}
+        table = pq.read_table(path)
+        if json.loads(table.schema.metadata[METADATA_KEY]).get("fetched_at") != fetched_at:
+            return {}
+        df = table.to_pandas()
+        df.index.name = None
+        return {freq: level.drop(columns="freq") for freq, level in df.groupby("freq", sort=False)}
+
+    def _save_rollups(self, stored: StoredSeries) -> None:
+        path = self.rollups_path_for(stored.series_id)
+        if not stored.rollups:
+            path.unlink(missing_ok=True)
+            return
+        df = pd.concat([level.assign(freq=freq) for freq, level in stored.rollups.items()])
+        df.index.name = "date"
+        self._write(pa.Table.from_pandas(df), path, {"series_id": stored.series_id, "fetched_at": stored.fetched_at})
+
+    def load(self, series_id: str) -> StoredSeries | None:
+        path = self.path_for(series_id)
+        if not path.exists():
+            return None
+
+        table = pq.read_table(path)
+        meta = json.loads(table.schema.metadata[METADATA_KEY])
+        series = table.to_pandas()["value"]
+        series.name = None
+        series.index.name = None
+        fetched_at = meta.get("fetched_at", 0.0)
+
+        return StoredSeries(
+            series_id=series_id,
+            series=series,
+            last_updated=meta.get("last_updated"),
+            frequency=meta.get("frequency"),
+            units=meta.get("units"),
+            fetched_at=fetched_at,
+            full_synced_at=meta.get("full_synced_at", 0.0),
+            coverage_start=meta.get("coverage_start"),
+            coverage_end=meta.get("coverage_end"),
+            rollups=self._load_rollups(series_id, fetched_at),
+        )
+
+    def save(self, stored: StoredSeries) -> None:
+        df = stored.series.rename("value").to_frame()
+        df.index.name = "date"
+        with self._lock:
+            self.rollups_path_for(stored.series_id).parent.mkdir(parents=True, exist_ok=True)
+        self._save_rollups(stored)
+        self._write(pa.Table.from_pandas(df), self.path_for(stored.series_id), stored.metadata())
+
+    def metadata(self, series_id: str) -> dict | None:
+        path = self.path_for(series_id)
+        if not path.exists():
+            return None
+        schema = pq.read_schema(path)
+        return json.loads(schema.metadata[METADATA_KEY])
+
+    def delete(self, series_id: str) -> bool:
+        self.rollups_path_for(series_id).unlink(missing_ok=True)
+        path = self.path_for(series_id)
+        if path.exists():
+            path.unlink()
+            return True
+        return False
+
+    def series_ids(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.stem for p in self.root.glob("*.parquet"))
+
+
+store = SeriesStore()
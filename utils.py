@@ -4,64 +4,47 @@ import numpy as np
 import matplotlib as plt
 
 
-def scale_for_inflation(cpi_df: pd.DataFrame, from_year: int, to_year: int, amount: float):
-    from_year_cpi = cpi_df.loc[cpi_df['Year'] == from_year, 'CPI'].values[0]
-    to_year_cpi = cpi_df.loc[cpi_df['Year'] == to_year, 'CPI'].values[0]
-    adjusted_value = (amount * (to_year_cpi / from_year_cpi))
-    
-    return round(adjusted_value, 2)
-
-
 def merge_on_date(dfs, how='inner'):
+    """
+    Merge a list of dataframes on the 'Date' column, dropping any Year/Month/Day columns.
+    Keeps pd.merge semantics: repeated column names get _x/_y suffixes and duplicate dates
+    multiply rows. The API's composites use `join.align` instead.
+    """
     cleaned = []
     for i, df in enumerate(dfs):
         if 'Date' not in df.columns:
             raise ValueError(f"DataFrame at index {i} is missing 'Date' column.")
+        cleaned.append(df.drop(columns=[c for c in ['Year', 'Month', 'Day'] if c in df.columns]))
 
-        # Drop Year/Month/Day if present
-        drop_cols = [c for c in ['Year', 'Month', 'Day'] if c in df.columns]
-        df = df.drop(columns=drop_cols)
-
-        cleaned.append(df)
-
-    merged_df = reduce(lambda left, right: pd.merge(left, right, on='Date', how=how), cleaned)
-    return merged_df
+    return reduce(lambda left, right: pd.merge(left, right, on='Date', how=how), cleaned)
 
 
 def merge_on_year(dfs, how='inner'):
     """
-    Merge a list of dataframes on the 'Year' column.
+    Merge a list of dataframes on the 'Year' column, with pd.merge semantics as for
+    `merge_on_date`.
     """
-    # Safety check: make sure they all have 'Year' column
     for i, df in enumerate(dfs):
         if 'Year' not in df.columns:
             raise ValueError(f"DataFrame at index {i} is missing 'Year' column.")
 
-    merged_df = reduce(lambda left, right: pd.merge(left, right, on='Year', how=how), dfs)
-    
-    return merged_df
+    return reduce(lambda left, right: pd.merge(left, right, on='Year', how=how), dfs)
 
 
 def calc_mtg_pi_payment(principal, annual_rate, years=30):
     """
-    Calculate monthly principal & interest payment for a mortgage.
+    Calculate monthly principal & interest payment for a mortgage. Principal and rate may
+    be arrays, in which case every payment is computed at once.
     """
-    monthly_rate = (annual_rate / 100) / 12
+    monthly_rate = (np.asarray(annual_rate, dtype='float64') / 100) / 12
     n_payments = years * 12
-    
-    if monthly_rate == 0:
-        return principal / n_payments
-    
-    payment = principal * (monthly_rate * (1 + monthly_rate) ** n_payments) / \
-              ((1 + monthly_rate) ** n_payments - 1)
-    
-    return payment
 
+    growth = (1 + monthly_rate) ** n_payments
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = np.where(monthly_rate == 0, principal / n_payments,
+                           principal * (monthly_rate * growth) / (growth - 1))
 
-def sanitize_for_json(df: pd.DataFrame) -> list[dict]:
-    """Convert a DataFrame into JSON-safe records."""
-    safe_df = df.replace({np.nan: None})
-    return safe_df.to_dict(orient="records")
+    return payment if payment.ndim else payment.item()
 
 
 def add_real_prices(df):
@@ -0,0 +1,126 @@
+import asyncio
+import inspect
+import time
+from dotenv import load_dotenv
+import os
+from fastapi.params import Depends
+from fastapi.routing import APIRoute
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined
+from series_cache import prefetch
+
+load_dotenv()
+
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
+
+def module_series_ids(modules: dict) -> list[str]:
+    """
+    Every FRED series declared by the fetch functions of the given category modules.
+    """
+    ids = []
+    for module in modules.values():
+        for fn_name, fn in module.__dict__.items():
+            if callable(fn) and fn_name.startswith("_fetch"):
+                ids.extend(getattr(fn, "series_ids", ()))
+    return list(dict.fromkeys(ids))
+
+
+def default_params(endpoint) -> dict | None:
+    """
+    The query parameters a route is called with when the client passes none, or None if
+    the route has a required parameter.
+    """
+    params = {}
+    for name, param in inspect.signature(endpoint).parameters.items():
+        default = param.default
+        if isinstance(default, Depends):
+            # Plain dependencies such as main.response_format are resolved from their own defaults
+            inner = default_params(default.dependency)
+            if inner is None:
+                return None
+            default = default.dependency(**inner)
+        if isinstance(default, FieldInfo):
+            default = default.default
+        if default is inspect.Parameter.empty or default is PydanticUndefined:
+            return None
+        params[name] = default
+    return params
+
+
+class Warmup:
+    """
+    Startup warm-up: loads every series the category modules use, then calls each dataset
+    route once with its default parameters so those responses are already memoized.
+    The app stays not-ready until it finishes, successful or not.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.state = "idle"
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.series_loaded = 0
+        self.responses_built = 0
+        self.errors: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return not self.enabled or self.state == "ready"
+
+    def start(self, modules: dict, routes: list) -> asyncio.Task:
+        self.enabled = True
+        self.state = "warming"
+        self._task = asyncio.create_task(self.run(modules, routes))
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self, modules: dict, routes: list) -> None:
+        self.started_at = time.time()
+
+        ids = module_series_ids(modules)
+        results = await prefetch(*ids, return_exceptions=True)
+        for series_id, result in zip(ids, results):
+            if isinstance(result, Exception):
+                self.errors[series_id] = str(result)
+            else:
+                self.series_loaded += 1
+
+        # Dataset routes are the async GET handlers; admin and status routes are plain functions
+        calls = {}
+        for route in routes:
+            if isinstance(route, APIRoute) and "GET" in route.methods and inspect.iscoroutinefunction(route.endpoint):
+                params = default_params(route.endpoint)
+                if params is not None:
+                    calls[route.path] = route.endpoint(**params)
+
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        for path, result in zip(calls, results):
+            if isinstance(result, Exception):
+                self.errors[path] = getattr(result, "detail", None) or str(result)
+            else:
+                self.responses_built += 1
+
+        self.finished_at = time.time()
+        self.state = "ready"
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup": self.state if self.enabled else "disabled",
+            "series_loaded": self.series_loaded,
+            "responses_built": self.responses_built,
+            "duration": round(self.finished_at - self.started_at, 3) if self.finished_at else None,
+            "errors": self.errors,
+        }
+
+
+warmup = Warmup()